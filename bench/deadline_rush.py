@@ -0,0 +1,292 @@
+# bench/deadline_rush.py
+"""
+Deadline-rush benchmark: a whole class logs in, opens the dashboard and
+submits in the same minute, then the teacher opens the submissions page.
+
+Seeds a throw-away database (N students, exams, earlier submissions), replays
+login -> /student/dashboard -> /submit_exam -> /teacher/submissions at the
+given concurrency and writes latency percentiles, throughput and SQL queries
+per request for every route to a JSON file.
+
+    python bench/deadline_rush.py --students 150 --concurrency 30
+    python bench/deadline_rush.py --mode server            # real HTTP, local threaded server
+    python bench/deadline_rush.py --baseline bench/results/old.json   # exit 1 on regressions
+"""
+import os, sys, io, json, time, math, shutil, logging, platform, argparse, tempfile, threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import has_request_context, request
+from sqlalchemy import event, insert
+from werkzeug.security import generate_password_hash
+
+import app as smart_lab
+from models import db, User, Profile, Exam, Submission
+
+PASSWORD = 'bench-password'
+
+# --------------------------------------------------
+# Seeding
+# --------------------------------------------------
+def seed(app, students, exams, history, iterations=None):
+    """Bulk-insert a teacher, `students` students with profiles, `exams` open exams and
+    `history` earlier submissions per exam (spread over the students)."""
+    method = f'pbkdf2:sha256:{iterations}' if iterations else 'pbkdf2:sha256'   # signup uses the default
+    hashed = generate_password_hash(PASSWORD, method=method, salt_length=8)      # hashed once, shared
+    now = datetime.utcnow()
+    with app.app_context():
+        db.create_all()
+        db.session.execute(insert(User), [{'id': 1, 'username': 'teacher', 'email': 'teacher@bench',
+                                           'password': hashed, 'role': 'teacher'}] +
+                           [{'id': i + 2, 'username': f'student{i}', 'email': f'student{i}@bench',
+                             'password': hashed, 'role': 'student'} for i in range(students)])
+        db.session.execute(insert(Profile), [{'user_id': i + 2, 'full_name': f'Student {i}', 'department': 'CSE',
+                                              'roll': f'R{i:04d}'} for i in range(students)])
+        db.session.execute(insert(Exam), [{'id': e + 1, 'title': f'Lab exam {e + 1}', 'description': 'bench',
+                                           'duration_minutes': 120, 'start_time': now - timedelta(minutes=60),
+                                           'end_time': now + timedelta(minutes=60), 'teacher_id': 1,
+                                           'published': False} for e in range(exams)])
+        digest, _ = smart_lab.blob_store.put(io.BytesIO(b'int main(void) { return 0; }\n'))
+        # earlier submissions go to the exams the rush does not submit to (all but exam 1)
+        rows = []
+        for e in range(1, exams):
+            for i in range(min(history, students)):
+                rows.append({'exam_id': e + 1, 'student_id': i + 2, 'file_name': f'{i + 2}_{e + 1}_old_main.c',
+                             'content_hash': digest, 'submitted_at': now - timedelta(minutes=30), 'mark': None})
+        if rows:
+            db.session.execute(insert(Submission), rows)
+        db.session.commit()
+
+# --------------------------------------------------
+# Measuring
+# --------------------------------------------------
+class QueryCounter:
+    """Counts SQL statements per Flask endpoint (only for apps running in this process)."""
+
+    def __init__(self, engine):
+        self.counts = defaultdict(int)
+        self._lock = threading.Lock()
+        event.listen(engine, 'before_cursor_execute', self._count)
+
+    def _count(self, *args):
+        if has_request_context():
+            with self._lock:
+                self.counts[request.endpoint or '?'] += 1
+
+class Recorder:
+    def __init__(self):
+        self.samples = defaultdict(list)    # route -> [seconds]
+        self.errors = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def record(self, route, seconds, ok):
+        with self._lock:
+            self.samples[route].append(seconds)
+            if not ok:
+                self.errors[route] += 1
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    k = max(0, math.ceil(p / 100 * len(sorted_values)) - 1)
+    return sorted_values[k]
+
+# --------------------------------------------------
+# Clients: the same flow over the Flask test client or real HTTP
+# --------------------------------------------------
+class TestClientUser:
+    def __init__(self, app, base_url=None):
+        self.client = app.test_client()
+
+    def get(self, path):
+        r = self.client.get(path)
+        return r.status_code, r.get_data()
+
+    def post(self, path, data, files=None):
+        data = dict(data)
+        if files:
+            data.update({k: (io.BytesIO(content), name) for k, (name, content) in files.items()})
+        r = self.client.post(path, data=data, content_type='multipart/form-data' if files else None)
+        return r.status_code, r.get_data()
+
+class HttpUser:
+    def __init__(self, app, base_url):
+        import requests
+        self.base_url = base_url
+        self.session = requests.Session()
+
+    def get(self, path):
+        r = self.session.get(self.base_url + path, allow_redirects=False)
+        return r.status_code, r.content
+
+    def post(self, path, data, files=None):
+        r = self.session.post(self.base_url + path, data=data, allow_redirects=False,
+                              files={k: (name, content) for k, (name, content) in (files or {}).items()})
+        return r.status_code, r.content
+
+def timed(recorder, route, call, *args, **kwargs):
+    start = time.perf_counter()
+    try:
+        status, body = call(*args, **kwargs)
+        ok = status < 400 and b'"status":"error"' not in body.replace(b' ', b'')
+    except Exception:
+        ok = False
+    recorder.record(route, time.perf_counter() - start, ok)
+
+def student_flow(user_cls, app, base_url, recorder, index, file_bytes):
+    user = user_cls(app, base_url)
+    timed(recorder, 'login', user.post, '/login',
+          {'email': f'student{index}@bench', 'password': PASSWORD, 'role': 'student'})
+    timed(recorder, 'student_dashboard', user.get, '/student/dashboard')
+    timed(recorder, 'exam_clock', user.get, '/exam/clock')
+    timed(recorder, 'submit_exam', user.post, '/submit_exam', {'exam_id': '1', 'software': 'Code::Blocks'},
+          files={'file': ('main.c', file_bytes)})
+
+def teacher_flow(user_cls, app, base_url, recorder, rounds):
+    user = user_cls(app, base_url)
+    timed(recorder, 'login', user.post, '/login',
+          {'email': 'teacher@bench', 'password': PASSWORD, 'role': 'teacher'})
+    for _ in range(rounds):
+        timed(recorder, 'teacher_submissions', user.get, '/teacher/submissions/1')
+        timed(recorder, 'teacher_submissions_light', user.get, '/teacher/submissions/1?view=light')
+
+# --------------------------------------------------
+# Runner
+# --------------------------------------------------
+# route label used by the recorder -> Flask endpoint seen by the query counter
+ENDPOINTS = {'login': 'main.login', 'student_dashboard': 'main.student_dashboard',
+             'exam_clock': 'main.exam_clock_feed', 'submit_exam': 'main.submit_exam',
+             'teacher_submissions': 'main.teacher_submissions',
+             'teacher_submissions_light': 'main.teacher_submissions'}
+
+def run(args):
+    workdir = tempfile.mkdtemp(prefix='smartlab_bench_')
+    try:
+        app = smart_lab.create_app({
+            'SQLALCHEMY_DATABASE_URI': 'sqlite:///' + os.path.join(workdir, 'bench.db'),
+            'STORAGE_MODE': 'production',
+            'UPLOAD_FOLDER': os.path.join(workdir, 'submissions'),
+            'BLOB_FOLDER': os.path.join(workdir, 'submissions', 'blobs'),
+            'SOFTWARE_CONFIG_RELOAD': 0,
+        })
+        seed(app, args.students, args.exams, args.history, args.password_iterations)
+        with app.app_context():
+            counter = QueryCounter(db.engine)
+
+        server = base_url = None
+        user_cls = TestClientUser
+        if args.mode == 'server':
+            from werkzeug.serving import make_server
+            logging.getLogger('werkzeug').setLevel(logging.ERROR)     # no access log per request
+            server = make_server('127.0.0.1', 0, app, threaded=True)
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            base_url = f'http://127.0.0.1:{server.server_port}'
+            user_cls = HttpUser
+
+        recorder = Recorder()
+        file_bytes = os.urandom(args.file_kb * 1024)
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            futures = [pool.submit(student_flow, user_cls, app, base_url, recorder, i, file_bytes)
+                       for i in range(args.students)]
+            futures.append(pool.submit(teacher_flow, user_cls, app, base_url, recorder, args.teacher_rounds))
+            for f in futures:
+                f.result()
+        wall = time.perf_counter() - started
+        if server:
+            server.shutdown()
+        return report(args, recorder, counter, wall)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+def report(args, recorder, counter, wall):
+    routes, total = {}, 0
+    requests_per_endpoint = defaultdict(int)
+    for route, samples in recorder.samples.items():
+        requests_per_endpoint[ENDPOINTS.get(route, route)] += len(samples)
+    for route, samples in sorted(recorder.samples.items()):
+        values = sorted(samples)
+        total += len(values)
+        endpoint = ENDPOINTS.get(route, route)
+        queries = counter.counts.get(endpoint)
+        routes[route] = {
+            'count': len(values),
+            'errors': recorder.errors[route],
+            'p50_ms': round(percentile(values, 50) * 1000, 2),
+            'p95_ms': round(percentile(values, 95) * 1000, 2),
+            'p99_ms': round(percentile(values, 99) * 1000, 2),
+            'mean_ms': round(sum(values) / len(values) * 1000, 2),
+            'max_ms': round(values[-1] * 1000, 2),
+            'throughput_rps': round(len(values) / wall, 1),
+            # averaged per endpoint: the two teacher_submissions views share one counter
+            'queries_per_request': round(queries / requests_per_endpoint[endpoint], 2) if queries else 0,
+        }
+    return {
+        'benchmark': 'deadline_rush',
+        'created_at': datetime.utcnow().isoformat() + 'Z',
+        'config': vars(args),
+        'environment': {'python': platform.python_version(), 'platform': platform.platform(),
+                        'cpus': os.cpu_count()},
+        'wall_seconds': round(wall, 3),
+        'requests': total,
+        'throughput_rps': round(total / wall, 1),
+        'routes': routes,
+    }
+
+def compare(result, baseline, tolerance):
+    """Routes whose p95 grew by more than `tolerance` (fraction) against the baseline file."""
+    regressions = []
+    for route, now in result['routes'].items():
+        before = baseline.get('routes', {}).get(route)
+        if before and before['p95_ms'] and now['p95_ms'] > before['p95_ms'] * (1 + tolerance):
+            regressions.append(f"{route}: p95 {before['p95_ms']} ms -> {now['p95_ms']} ms")
+        if before and now['queries_per_request'] - before['queries_per_request'] >= 1:
+            regressions.append(f"{route}: queries/request {before['queries_per_request']} -> "
+                               f"{now['queries_per_request']}")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--students', type=int, default=150)
+    parser.add_argument('--exams', type=int, default=3)
+    parser.add_argument('--history', type=int, default=150, help='earlier submissions per other exam')
+    parser.add_argument('--concurrency', type=int, default=30)
+    parser.add_argument('--teacher-rounds', type=int, default=20, help='submissions page loads during the rush')
+    parser.add_argument('--file-kb', type=int, default=16)
+    parser.add_argument('--password-iterations', type=int, default=None,
+                        help='pbkdf2 rounds for the seeded users; lower it to keep login from hiding the other routes')
+    parser.add_argument('--mode', choices=('client', 'server'), default='client',
+                        help='Flask test client, or real HTTP against a local threaded server')
+    parser.add_argument('--out', default=None, help='JSON file (default bench/results/deadline_rush-<time>.json)')
+    parser.add_argument('--baseline', default=None, help='earlier result to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed p95 growth vs. baseline')
+    args = parser.parse_args(argv)
+
+    result = run(args)
+    out = args.out or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results',
+                                   f"deadline_rush-{datetime.utcnow():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, 'w') as f:
+        json.dump(result, f, indent=2)
+
+    print(f"{result['requests']} requests in {result['wall_seconds']} s ({result['throughput_rps']} req/s)")
+    print(f"{'route':<28}{'n':>6}{'err':>5}{'p50':>9}{'p95':>9}{'p99':>9}{'q/req':>7}")
+    for route, r in result['routes'].items():
+        print(f"{route:<28}{r['count']:>6}{r['errors']:>5}{r['p50_ms']:>9}{r['p95_ms']:>9}{r['p99_ms']:>9}"
+              f"{r['queries_per_request']:>7}")
+    print(f"Saved {out}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(result, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"[Regression] {line}")
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,22 @@
+# gunicorn.conf.py
+import os, multiprocessing
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 8000)}"
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+# threaded workers: an open SSE stream holds a thread, not a whole process
+worker_class = 'gthread'
+threads = int(os.environ.get('WEB_THREADS', 8))
+timeout = 120
+accesslog = '-'
+
+# several processes: job progress and SSE events go through the database,
+# and SQLite needs WAL + busy_timeout to be shared between them
+os.environ.setdefault('SHARED_STATE', 'database')
+os.environ.setdefault('STORAGE_MODE', 'production')
+# installs, detection and autograding run in worker.py, never in a web worker
+os.environ.setdefault('JOB_WORKER', 'external')
+
+def on_starting(server):
+    """Runs once in the master before any worker is forked."""
+    from app import create_app, startup
+    startup(create_app())
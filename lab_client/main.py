@@ -2,7 +2,7 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 import json, os, threading, socket, subprocess, webbrowser
-from utils import is_installed, download_with_progress
+from utils import check_all, report_checks, download_with_progress
 
 SERVER_URL = "http://<SERVER_IP>:5000"  # change to your server IP or localhost for testing
 
@@ -13,27 +13,17 @@ with open(os.path.join(BASE_DIR, "config.json"), "r", encoding="utf-8") as f:
 DOWNLOADS = os.path.join(BASE_DIR, "downloads")
 os.makedirs(DOWNLOADS, exist_ok=True)
 
-def report_check(hostname, software, status, path=""):
+def report_all(hostname, results):
     try:
-        import requests
-        requests.post(f"{SERVER_URL}/api/report_check", json={
-            "hostname": hostname, "software": software, "status": status, "path": path
-        }, timeout=6)
+        report_checks(SERVER_URL, hostname, results)
     except Exception as e:
         print("Report failed:", e)
 
 def do_check_all(progress_var=None):
     hostname = socket.gethostname()
-    results = []
-    for s in CONFIG.get("softwares", []):
-        name = s.get("name")
-        path = s.get("path_windows")
-        cmd = s.get("cmd")
-        installed = is_installed(path, cmd)
-        status = "Installed" if installed else "Not Installed"
-        results.append((name, status, path if installed else ""))
-        # report each to server (non-blocking)
-        threading.Thread(target=report_check, args=(hostname, name, status, path if installed else ""), daemon=True).start()
+    results = check_all(CONFIG.get("softwares", []))
+    # one batched report for the whole host (non-blocking)
+    threading.Thread(target=report_all, args=(hostname, results), daemon=True).start()
     return results
 
 # GUI
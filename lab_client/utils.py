@@ -1,7 +1,11 @@
 # lab_client/utils.py
-import os, subprocess, glob, webbrowser, sys, requests
+import os, subprocess, glob, webbrowser, sys, requests, json, gzip
+from concurrent.futures import ThreadPoolExecutor
 
-def is_installed(path=None, cmd=None, package=None):
+# one keep-alive connection pool for everything we send to the lab server
+SESSION = requests.Session()
+
+def is_installed(path=None, cmd=None, package=None, timeout=5):
     try:
         if path:
             if '*' in path:
@@ -11,7 +15,7 @@ def is_installed(path=None, cmd=None, package=None):
         pass
     if cmd:
         try:
-            cp = subprocess.run(cmd, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            cp = subprocess.run(cmd, shell=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=timeout)
             return cp.returncode == 0
         except:
             return False
@@ -23,6 +27,25 @@ def is_installed(path=None, cmd=None, package=None):
             return False
     return False
 
+def check_all(softwares, max_workers=8, timeout=5):
+    """Probe every software concurrently. Returns [(name, status, path)] in config order."""
+    def check(s):
+        path = s.get("path_windows")
+        installed = is_installed(path, s.get("cmd"), timeout=timeout)
+        return (s.get("name"), "Installed" if installed else "Not Installed", path if installed else "")
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(check, softwares))
+
+def report_checks(server_url, hostname, results, timeout=10):
+    """Send all results for this host in one gzip-compressed request."""
+    body = json.dumps({"hostname": hostname, "checks": [
+        {"software": name, "status": status, "path": path} for name, status, path in results
+    ]}).encode()
+    r = SESSION.post(f"{server_url}/api/report_checks", data=gzip.compress(body), timeout=timeout,
+                     headers={"Content-Type": "application/json", "Content-Encoding": "gzip"})
+    r.raise_for_status()
+    return r.json()
+
 def download_with_progress(url, dest_path, progress_callback=None):
     headers = {"User-Agent":"Mozilla/5.0"}
     with requests.get(url, stream=True, headers=headers, allow_redirects=True, timeout=30) as r:
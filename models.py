@@ -1,19 +1,27 @@
-from flask_sqlalchemy import SQLAlchemy
+import os
 from datetime import datetime
+from flask import current_app
+from flask_login import UserMixin
+from flask_sqlalchemy import SQLAlchemy
 
 db = SQLAlchemy()
 
+def exam_clock():
+    """The one clock exam windows are judged by: naive UTC, like every stored DateTime."""
+    return datetime.utcnow()
+
 # -------------------------
 # USER MODEL
 # -------------------------
-class User(db.Model):
+class User(UserMixin, db.Model):
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(80), unique=True, nullable=False)
     email = db.Column(db.String(120), unique=True, nullable=False)
     password = db.Column(db.String(200), nullable=False)
-    role = db.Column(db.String(50), nullable=False)  # 'teacher', 'student', or 'lab_assistant'
+    role = db.Column(db.String(50), nullable=False)  # teacher, student, lab_assistant
+
+    __table_args__ = (db.Index('ix_user_email_role', 'email', 'role'),)
 
-    # Relationships
     profile = db.relationship('Profile', backref='user', uselist=False)
     submissions = db.relationship('Submission', backref='student', lazy=True)
     exams_created = db.relationship('Exam', backref='teacher', lazy=True)
@@ -30,6 +38,20 @@ class Profile(db.Model):
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
 
 
+# -------------------------
+# SOFTWARE MODEL
+# -------------------------
+class Software(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False, unique=True)
+    path_windows = db.Column(db.String(255))
+    cmd = db.Column(db.String(255))
+    type = db.Column(db.String(50))
+    url = db.Column(db.String(255))
+    sha256 = db.Column(db.String(64))  # optional installer checksum from config.json
+    is_installed = db.Column(db.Boolean, default=False)
+
+
 # -------------------------
 # EXAM MODEL
 # -------------------------
@@ -37,13 +59,37 @@ class Exam(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(120), nullable=False)
     description = db.Column(db.Text)
-    duration_minutes = db.Column(db.Integer, default=30)  # Exam duration in minutes
-    start_time = db.Column(db.DateTime, nullable=True)
+    duration_minutes = db.Column(db.Integer, default=30)
+    start_time = db.Column(db.DateTime, nullable=True, index=True)
     end_time = db.Column(db.DateTime, nullable=True)
-    published = db.Column(db.Boolean, default=False)  # Marks/results published or not
-    teacher_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    published = db.Column(db.Boolean, default=False)
+    teacher_id = db.Column(db.Integer, db.ForeignKey('user.id'), index=True)
+    max_upload_kb = db.Column(db.Integer, nullable=True)          # None = UPLOAD_MAX_BYTES
+    allowed_extensions = db.Column(db.String(255), nullable=True)  # e.g. ".c,.cpp"; None = any
 
     submissions = db.relationship('Submission', backref='exam', lazy=True)
+    test_cases = db.relationship('ExamTestCase', backref='exam', lazy=True)
+
+    @property
+    def time_remaining(self):
+        if self.end_time:
+            remaining = (self.end_time - exam_clock()).total_seconds()
+            return max(0, int(remaining))
+        return 0
+
+    @property
+    def upload_limit(self):
+        limit = current_app.config['UPLOAD_MAX_BYTES']
+        if self.max_upload_kb:
+            limit = min(limit, self.max_upload_kb * 1024)
+        return limit
+
+    def allows_extension(self, filename):
+        if not self.allowed_extensions:
+            return True
+        allowed = {e.strip().lower() if e.strip().startswith('.') else '.' + e.strip().lower()
+                   for e in self.allowed_extensions.split(',') if e.strip()}
+        return os.path.splitext(filename)[1].lower() in allowed
 
 
 # -------------------------
@@ -51,48 +97,123 @@ class Exam(db.Model):
 # -------------------------
 class Submission(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    file_name = db.Column(db.String(255))  # Path or filename of uploaded code
-    code = db.Column(db.Text)              # Optional: direct code submission
+    exam_id = db.Column(db.Integer, db.ForeignKey('exam.id'))
+    student_id = db.Column(db.Integer, db.ForeignKey('user.id'), index=True)
+    file_name = db.Column(db.String(255))
+    content_hash = db.Column(db.String(64), index=True)  # sha256 of the uploaded file in the blob store
+    code = db.Column(db.Text)
     mark = db.Column(db.Float)
     submitted_at = db.Column(db.DateTime, default=datetime.utcnow)
 
-    # Foreign Keys
-    exam_id = db.Column(db.Integer, db.ForeignKey('exam.id'))
-    student_id = db.Column(db.Integer, db.ForeignKey('user.id'))
+    # one row per student and exam; also serves every exam_id lookup
+    __table_args__ = (db.Index('uq_submission_exam_student', 'exam_id', 'student_id', unique=True),)
 
-    # Convenience properties
     @property
     def student_name(self):
-        """Return the student's full name or username."""
         if self.student and self.student.profile and self.student.profile.full_name:
             return self.student.profile.full_name
         return self.student.username if self.student else "Unknown"
 
     @property
     def exam_title(self):
-        """Return the title of the exam."""
         return self.exam.title if self.exam else "Unknown Exam"
 
 
 # -------------------------
-# SOFTWARE MODEL
+# EXAM TEST CASE MODEL
 # -------------------------
-class Software(db.Model):
+class ExamTestCase(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    name = db.Column(db.String(100), nullable=False, unique=True)
-    path_windows = db.Column(db.String(255))  # Path to executable
-    cmd = db.Column(db.String(255))           # Command to launch/check software
-    type = db.Column(db.String(50))           # exe, cmd, paid
-    url = db.Column(db.String(255))           # Official download URL
-    is_installed = db.Column(db.Boolean, default=False)
+    exam_id = db.Column(db.Integer, db.ForeignKey('exam.id'), nullable=False)
+    input_data = db.Column(db.Text)
+    expected_output = db.Column(db.Text)
+    points = db.Column(db.Float, default=1.0)
 
 
 # -------------------------
-# LAB CHECK MODEL
+# FINGERPRINT MODEL
+# -------------------------
+class Fingerprint(db.Model):
+    """Inverted index for plagiarism checks: one row per winnowed hash of a submission."""
+    id = db.Column(db.Integer, primary_key=True)
+    hash = db.Column(db.Integer, nullable=False)
+    submission_id = db.Column(db.Integer, db.ForeignKey('submission.id'), nullable=False, index=True)
+    exam_id = db.Column(db.Integer, index=True)
+
+    __table_args__ = (db.Index('ix_fingerprint_hash_exam', 'hash', 'exam_id'),)
+
+
+# -------------------------
+# LAB CHECK MODELS
 # -------------------------
 class LabCheck(db.Model):
+    """One software check reported by a lab PC."""
     id = db.Column(db.Integer, primary_key=True)
-    software_name = db.Column(db.String(100))
-    path = db.Column(db.String(255))
-    is_installed = db.Column(db.Boolean, default=False)
-    date_checked = db.Column(db.DateTime, default=datetime.utcnow)
+    hostname = db.Column(db.String(200))
+    software = db.Column(db.String(200))
+    status = db.Column(db.String(50))
+    path = db.Column(db.String(400))
+    checked_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+
+    __table_args__ = (db.Index('ix_lab_check_host_software', 'hostname', 'software', 'checked_at'),)
+
+
+class LabSoftwareState(db.Model):
+    """Latest reported status per (hostname, software); kept current on every ingest."""
+    hostname = db.Column(db.String(200), primary_key=True)
+    software = db.Column(db.String(200), primary_key=True)
+    status = db.Column(db.String(50))
+    path = db.Column(db.String(400))
+    checked_at = db.Column(db.DateTime)
+
+    __table_args__ = (db.Index('ix_lab_state_software_status', 'software', 'status'),)
+
+
+# -------------------------
+# SHARED STATE (multi-worker)
+# -------------------------
+class SharedState(db.Model):
+    """JSON value per key that every web worker sees, e.g. install job progress."""
+    key = db.Column(db.String(255), primary_key=True)
+    value = db.Column(db.Text)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+class SharedEvent(db.Model):
+    """Short-lived log that relays Server-Sent Events between web workers."""
+    id = db.Column(db.Integer, primary_key=True)
+    origin = db.Column(db.String(100))
+    kind = db.Column(db.String(50))
+    data = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+
+    # ids must never be reused after pruning, the relay reads "everything after id N"
+    __table_args__ = {'sqlite_autoincrement': True}
+
+
+# -------------------------
+# BACKGROUND JOBS
+# -------------------------
+class QueuedJob(db.Model):
+    """Persistent background job (install, detection refresh, autograde); run by worker.py."""
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(50), nullable=False)
+    key = db.Column(db.String(255))                  # at most one queued / running job per (kind, key)
+    payload = db.Column(db.Text)
+    priority = db.Column(db.Integer, default=0)
+    state = db.Column(db.String(20), default='queued')
+    progress = db.Column(db.Integer, default=0)
+    attempts = db.Column(db.Integer, default=0)
+    max_attempts = db.Column(db.Integer, default=3)
+    error = db.Column(db.Text)
+    result = db.Column(db.Text)
+    cancel_requested = db.Column(db.Boolean, default=False)
+    locked_by = db.Column(db.String(100))
+    heartbeat_at = db.Column(db.DateTime)
+    run_after = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+
+    __table_args__ = (db.Index('ix_queued_job_claim', 'state', 'priority', 'run_after'),
+                      db.Index('ix_queued_job_kind_key', 'kind', 'key'))
@@ -1,26 +1,9 @@
-import json
-from app import db, Software
+# Apply config.json to the Software table (same as `flask --app app sync-software --force`)
+from app import create_app, sync_software_config
 
-# Load config.json
-with open('config.json', 'r') as f:
-    data = json.load(f)
+app = create_app()
 
-softwares = data.get('softwares', [])
+with app.app_context():
+    result = sync_software_config(force=True)
 
-for s in softwares:
-    # Check if software already exists
-    existing = Software.query.filter_by(name=s['name']).first()
-    if existing:
-        continue
-
-    software = Software(
-        name=s['name'],
-        path_windows=s.get('path_windows'),
-        cmd=s.get('cmd'),
-        type=s.get('type'),
-        url=s.get('url')
-    )
-    db.session.add(software)
-
-db.session.commit()
-print("Software table populated successfully!")
+print(f"Software table synced: {result}" if result else "Could not read config.json")
@@ -0,0 +1,12 @@
+# serve.py
+# Production server for Windows lab machines, where gunicorn does not run.
+# waitress is one process with many threads, so the in-memory shared state is enough.
+import os
+from waitress import serve
+from app import create_app, startup
+
+if __name__ == '__main__':
+    app = create_app()
+    startup(app)
+    serve(app, host=os.environ.get('HOST', '0.0.0.0'), port=int(os.environ.get('PORT', 8000)),
+          threads=int(os.environ.get('WEB_THREADS', 16)))
@@ -0,0 +1,45 @@
+// static/js/dashboard_student.js
+// urls come from the data-* attributes of the script tag
+const urls = document.currentScript.dataset;
+
+$(document).ready(function(){
+
+    // One countdown for all exams, synced with the server clock
+    new ExamClock(urls.clock, {
+        onExpire: function(examId){
+            $('.start-exam-btn[data-id="' + examId + '"]').replaceWith('<span class="text-muted">Cannot Submit</span>');
+        }
+    }).start();
+
+    // Start Exam
+    $('.start-exam-btn').click(function(){
+        let examId = $(this).data('id');
+        let examTitle = $(this).data('title');
+        $('#examIdInput').val(examId);
+        $('#submitModalLabel').text('Submit Exam for ' + examTitle);
+        $('#submitModal').modal('show');
+    });
+
+    // Submit Exam
+    $('#submitForm').submit(function(e){
+        e.preventDefault();
+        let formData = new FormData(this);
+
+        $.ajax({
+            url: urls.submit,
+            type: "POST",
+            data: formData,
+            processData: false,
+            contentType: false,
+            success: function(data){
+                if(data.status === 'success'){
+                    alert('Exam submitted successfully!');
+                    location.reload();
+                } else {
+                    alert(data.message);
+                }
+            }
+        });
+    });
+
+});
@@ -0,0 +1,97 @@
+// static/js/exam_clock.js
+// One countdown for every exam on the page, driven by the server clock.
+// Elements with data-exam-clock="<exam id>" show the time left; the page
+// resyncs with the /exam/clock feed (a cheap 304 while nothing changed).
+(function (window, document) {
+    'use strict';
+
+    function format(ms) {
+        var total = Math.max(0, Math.floor(ms / 1000));
+        var hours = Math.floor(total / 3600);
+        var minutes = Math.floor((total % 3600) / 60);
+        var seconds = total % 60;
+        return (hours ? hours + 'h ' : '') + minutes + 'm ' + seconds + 's remaining';
+    }
+
+    function ExamClock(url, options) {
+        options = options || {};
+        this.url = url;
+        this.onExpire = options.onExpire || function () {};
+        this.resyncMs = (options.resyncSeconds || 60) * 1000;
+        this.offset = 0;          // server time - local time, in ms
+        this.windows = {};        // exam id -> {start, end} in epoch ms
+        this.expired = {};
+        this.etag = null;
+        this.synced = false;      // nothing is shown as expired before the first answer
+    }
+
+    ExamClock.prototype.now = function () {
+        return Date.now() + this.offset;
+    };
+
+    ExamClock.prototype.sync = function () {
+        var self = this;
+        var sent = Date.now();
+        var headers = self.etag ? {'If-None-Match': self.etag} : {};
+        return fetch(self.url, {headers: headers, credentials: 'same-origin', cache: 'no-cache'})
+            .then(function (r) {
+                var received = Date.now();
+                var serverTime = parseInt(r.headers.get('X-Server-Time'), 10);
+                if (!isNaN(serverTime)) {
+                    // assume the server read its clock halfway through the round trip
+                    self.offset = serverTime - (sent + received) / 2;
+                }
+                if (r.status === 304) {
+                    return null;
+                }
+                self.etag = r.headers.get('ETag');
+                return r.json();
+            })
+            .then(function (data) {
+                if (data && data.exams) {
+                    var windows = {};
+                    data.exams.forEach(function (e) { windows[e.id] = e; });
+                    self.windows = windows;
+                    self.synced = true;
+                }
+                self.tick();
+            })
+            .catch(function () { /* keep counting with the last offset */ });
+    };
+
+    ExamClock.prototype.tick = function () {
+        var self = this;
+        if (!self.synced) return;
+        var now = self.now();
+        document.querySelectorAll('[data-exam-clock]').forEach(function (el) {
+            var id = el.getAttribute('data-exam-clock');
+            var w = self.windows[id];
+            var left = w ? w.end - now : 0;
+            if (w && w.start && now < w.start) {
+                el.textContent = 'Starts in ' + format(w.start - now).replace(' remaining', '');
+            } else if (left > 0) {
+                el.textContent = format(left);
+            } else {
+                el.textContent = 'Expired';
+                if (!self.expired[id]) {
+                    self.expired[id] = true;
+                    self.onExpire(id, el);
+                }
+            }
+        });
+    };
+
+    ExamClock.prototype.start = function () {
+        var self = this;
+        self.sync();
+        setInterval(function () { self.tick(); }, 1000);
+        setInterval(function () { self.sync(); }, self.resyncMs);
+        // laptops sleep and background tabs throttle timers: resync when the page comes back
+        document.addEventListener('visibilitychange', function () {
+            if (!document.hidden) self.sync();
+        });
+        return self;
+    };
+
+    window.ExamClock = ExamClock;
+})(window, document);
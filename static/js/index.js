@@ -0,0 +1,4 @@
+// static/js/index.js
+// Optional: Dynamically insert year
+const footer = document.querySelector('.footer');
+footer.innerHTML = footer.innerHTML.replace(footer.dataset.year, new Date().getFullYear());
@@ -0,0 +1,87 @@
+// static/js/lab_dashboard.js
+// urls come from the data-* attributes of the script tag
+const urls = document.currentScript.dataset;
+
+$(document).ready(function() {
+
+    // software name -> card id, so pushed events can find their row
+    const softwareIds = {};
+    $(".software-card").each(function() {
+        softwareIds[this.getAttribute("data-name")] = parseInt(this.id.replace("software-", ""), 10);
+    });
+    const installUrl = urls.install;
+
+    function showStatus(id, installed) {
+        let statusElem = $("#status-" + id);
+        let installBtn = $("#software-" + id).find(".install-btn");
+        let redirectBtn = $("#software-" + id).find(".redirect-btn");
+
+        if (installed) {
+            statusElem.text("Installed (detected via system)")
+                      .removeClass("not-installed")
+                      .addClass("installed");
+            $("#progress-" + id).addClass("d-none");
+            installBtn.replaceWith('<button class="btn btn-success" disabled>Installed</button>');
+            if (redirectBtn.length) redirectBtn.hide();
+        } else {
+            statusElem.text("Not Installed")
+                      .removeClass("installed")
+                      .addClass("not-installed");
+        }
+    }
+
+    function showProgress(job) {
+        let id = softwareIds[job.name];
+        if (id === undefined) return;
+        let progressContainer = $("#progress-" + id);
+        let btn = $("#software-" + id).find(".install-btn");
+
+        if (job.state === "queued" || job.state === "running") {
+            progressContainer.removeClass("d-none");
+            $("#progress-bar-" + id).css("width", job.progress + "%");
+            btn.prop("disabled", true).text(job.state === "queued" ? "Queued..." : "Installing " + job.progress + "%");
+        } else if (job.state === "done") {
+            $("#progress-bar-" + id).css("width", "100%");
+            btn.text("Launching installer...");
+        } else {
+            progressContainer.addClass("d-none");
+            $("#status-" + id).text(job.state === "cancelled" ? "Download cancelled" : "Auto-install failed")
+                              .removeClass("installed").addClass("not-installed");
+            btn.prop("disabled", false).text("Auto Install");
+        }
+    }
+
+    // 📡 Progress and status are pushed by the server; nothing is polled
+    if (window.EventSource) {
+        let source = new EventSource(urls.events);
+        source.addEventListener("progress", function(e) { showProgress(JSON.parse(e.data)); });
+        source.addEventListener("status", function(e) {
+            let data = JSON.parse(e.data);
+            showStatus(data.id, data.installed);
+        });
+    }
+
+    // ⚙️ Auto Install (progress arrives through the event stream)
+    $(".install-btn").click(function() {
+        let softwareId = $(this).data("id");
+        let softwareName = $(this).data("name");
+        let btn = $(this);
+
+        btn.prop("disabled", true).text("Queued...");
+        $.post(installUrl.replace("__name__", encodeURIComponent(softwareName)), function(data) {
+            if (data.installed) {
+                showStatus(softwareId, true);
+            } else if (data.job) {
+                showProgress(data.job);
+            } else if (data.status !== "success") {
+                alert(data.message + " Try manual download.");
+                btn.prop("disabled", false).text("Auto Install");
+            }
+        });
+    });
+
+    // 🌐 Manual Download Redirect
+    $(".redirect-btn").click(function() {
+        window.open($(this).data("url"), "_blank");
+    });
+});
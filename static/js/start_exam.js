@@ -0,0 +1,43 @@
+// static/js/start_exam.js
+// urls come from the data-* attributes of the script tag
+const urls = document.currentScript.dataset;
+
+$(document).ready(function(){
+
+    // Countdown Timer, synced with the server clock
+    new ExamClock(urls.clock, {
+        onExpire: function(){
+            alert("Time is up! Submit your code immediately.");
+            window.location.href = urls.dashboard;
+        }
+    }).start();
+
+    // Launch software alert
+    $('#launchSoftware').click(function(){
+        let software = $('#softwareSelect').val();
+        alert('Please open ' + software + ' on your PC, write your code, save locally, and then submit using the form below.');
+    });
+
+    // Submit Exam
+    $('#submitForm').submit(function(e){
+        e.preventDefault();
+        let formData = new FormData(this);
+
+        $.ajax({
+            url: urls.submit,
+            type: "POST",
+            data: formData,
+            processData: false,
+            contentType: false,
+            success: function(data){
+                if(data.status === 'success'){
+                    alert('Exam submitted successfully!');
+                    window.location.href = urls.dashboard;
+                } else {
+                    alert(data.message);
+                }
+            }
+        });
+    });
+
+});
@@ -0,0 +1,37 @@
+// static/js/take_exam.js
+// urls come from the data-* attributes of the script tag
+const urls = document.currentScript.dataset;
+
+$(document).ready(function(){
+
+    // Countdown Timer, synced with the server clock
+    new ExamClock(urls.clock, {
+        onExpire: function(){
+            alert("Time is over! Submitting automatically.");
+            $('#examForm').submit();
+        }
+    }).start();
+
+    // Optional: AJAX form submission
+    $('#examForm').submit(function(e){
+        e.preventDefault();
+        let formData = new FormData(this);
+
+        $.ajax({
+            url: urls.submit,
+            type: "POST",
+            data: formData,
+            processData: false,
+            contentType: false,
+            success: function(data){
+                if(data.status === 'success'){
+                    alert('Exam submitted successfully!');
+                    window.location.href = urls.dashboard;
+                } else {
+                    alert(data.message);
+                }
+            }
+        });
+    });
+
+});
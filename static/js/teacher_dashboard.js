@@ -0,0 +1,29 @@
+// static/js/teacher_dashboard.js
+// urls come from the data-* attributes of the script tag
+const urls = document.currentScript.dataset;
+
+$(document).ready(function(){
+
+    // Create Exam
+    $('#createExamForm').submit(function(e){
+        e.preventDefault();
+        let formData = {
+            'title': $('#examTitle').val(),
+            'description': $('#examDesc').val(),
+            'duration': $('#examDuration').val(),
+            'start_time': $('#examStartTime').val(),
+            'max_upload_kb': $('#examMaxUpload').val(),
+            'allowed_extensions': $('#examExtensions').val()
+        };
+
+        $.post(urls.createExam, formData, function(data){
+            if(data.status === 'success'){
+                alert('Exam created successfully!');
+                location.reload();
+            } else {
+                alert(data.message);
+            }
+        });
+    });
+
+});
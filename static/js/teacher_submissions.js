@@ -0,0 +1,44 @@
+// static/js/teacher_submissions.js
+// urls come from the data-* attributes of the script tag
+const urls = document.currentScript.dataset;
+
+// all edited marks (or a CSV file) go to the bulk endpoint in one request
+const marksUrl = urls.marks;
+
+function reportMarks(data) {
+    if (data.status !== 'success') {
+        alert(data.message);
+        return;
+    }
+    let message = data.updated + ' marks saved.';
+    if (data.errors.length) {
+        message += '\n' + data.errors.map(e => 'Row ' + e.row + ': ' + e.message).join('\n');
+    }
+    alert(message);
+    if (data.updated) location.reload();
+}
+
+const saveAll = document.getElementById('saveAllMarks');
+if (saveAll) {
+    saveAll.addEventListener('click', function() {
+        const marks = [];
+        document.querySelectorAll('.mark-input').forEach(function(input) {
+            if (input.value !== '' && input.value !== input.defaultValue) {
+                marks.push({submission_id: input.dataset.submissionId, mark: input.value});
+            }
+        });
+        if (!marks.length) {
+            alert('No marks changed.');
+            return;
+        }
+        fetch(marksUrl, {method: 'POST', headers: {'Content-Type': 'application/json'},
+                         body: JSON.stringify(marks)})
+            .then(r => r.json()).then(reportMarks);
+    });
+}
+
+document.getElementById('importMarksForm').addEventListener('submit', function(e) {
+    e.preventDefault();
+    fetch(marksUrl, {method: 'POST', body: new FormData(this)})
+        .then(r => r.json()).then(reportMarks);
+});
@@ -0,0 +1,60 @@
+# tests/conftest.py
+import os, sys
+from datetime import datetime, timedelta
+
+import pytest
+from werkzeug.security import generate_password_hash
+
+# the app is a flat set of modules, not an installed package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def app(tmp_path):
+    import app as appmod
+    upload = tmp_path / 'submissions'
+    app = appmod.create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'test.db'}",
+        'UPLOAD_FOLDER': str(upload),
+        'BLOB_FOLDER': str(upload / 'blobs'),
+        'JOB_WORKER': 'external',            # jobs stay queued, nothing runs in the background
+        'SOFTWARE_CONFIG_RELOAD': 0,
+    })
+    with app.app_context():
+        appmod.db.create_all()
+        yield app
+        appmod.db.session.remove()
+        appmod.db.engine.dispose()
+
+
+@pytest.fixture
+def make_user(app):
+    from models import db, User, Profile
+
+    def make_user(name, role='student', roll=None):
+        user = User(username=name, email=f'{name}@lab', password=generate_password_hash('secret'), role=role)
+        db.session.add(user)
+        db.session.flush()
+        db.session.add(Profile(full_name=name.title(), department='CSE', roll=roll, user_id=user.id))
+        db.session.commit()
+        return user
+    return make_user
+
+
+@pytest.fixture
+def exam(app, make_user):
+    from models import db, Exam
+    teacher = make_user('teacher', role='teacher')
+    exam = Exam(title='Lab 1', description='', duration_minutes=60, teacher_id=teacher.id,
+                start_time=datetime.utcnow(), end_time=datetime.utcnow() + timedelta(hours=1))
+    db.session.add(exam)
+    db.session.commit()
+    return exam
+
+
+def login(app, email, role):
+    client = app.test_client()
+    response = client.post('/login', data={'email': email, 'password': 'secret', 'role': role})
+    assert response.status_code == 302
+    return client
@@ -0,0 +1,54 @@
+# tests/test_autograder.py
+import shutil
+
+import pytest
+
+from models import db, ExamTestCase
+from utils.autograder import grade_submission
+from conftest import login
+
+needs_gcc = pytest.mark.skipif(not shutil.which('gcc'), reason='needs gcc')
+
+SUM = '#include <stdio.h>\nint main(){int a,b; scanf("%d %d",&a,&b); printf("%d\\n",a+b); return 0;}\n'
+FLOOD = '#include <stdio.h>\nint main(){char b[65536]={0}; for(;;) fwrite(b,1,sizeof b,stdout);}\n'
+SPIN = 'int main(){for(;;);}\n'
+
+
+def grade(code, cases, **limits):
+    return grade_submission({'submission_id': 1, 'code': code, 'cases': cases, 'limits': limits})
+
+
+@needs_gcc
+def test_passing_and_failing_cases():
+    result = grade(SUM, [('2 3', '5\n', 2), ('1 1', '3', 1)])
+    assert result['compiled'] and result['passed'] == 1 and result['score'] == 2 and result['total'] == 3
+
+
+@needs_gcc
+def test_compile_error_is_reported():
+    result = grade('int main( {', [('', '', 1)])
+    assert not result['compiled'] and result['error']
+
+
+@needs_gcc
+def test_output_flood_stops_at_output_kb():
+    result = grade(FLOOD, [('', '', 1)], output_kb=64)
+    assert result['error'] == 'output_limit' and result['score'] == 0
+
+
+@needs_gcc
+def test_endless_loop_times_out():
+    result = grade(SPIN, [('', '', 1)], time=0.5, cpu=1)
+    assert result['error'] == 'timeout'
+
+
+def test_autograde_refused_without_isolation(app, exam):
+    db.session.add(ExamTestCase(exam_id=exam.id, input_data='1 2', expected_output='3', points=1))
+    db.session.commit()
+    client = login(app, 'teacher@lab', 'teacher')
+    response = client.post(f'/teacher/autograde/{exam.id}')
+    assert response.status_code == 409 and 'AUTOGRADE_SANDBOX' in response.get_json()['message']
+
+    app.config['AUTOGRADE_SANDBOX'] = ['unshare', '--net', '--map-root-user']
+    response = client.post(f'/teacher/autograde/{exam.id}')
+    assert response.status_code == 202 and response.get_json()['job']['kind'] == 'autograde'
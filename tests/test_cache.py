@@ -0,0 +1,65 @@
+# tests/test_cache.py
+import time
+
+import app as appmod
+from utils.cache import FragmentCache, TTLCache
+from utils.sharedstate import MemoryState
+from conftest import login
+
+
+def test_ttl_cache_expires_and_evicts_least_recently_used(monkeypatch):
+    cache = TTLCache(ttl=10, maxsize=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1            # 'b' is now least recently used
+    cache.set('c', 3)
+    assert cache.get('b') is None and cache.get('a') == 1 and cache.get('c') == 3
+    now = time.monotonic()
+    monkeypatch.setattr(time, 'monotonic', lambda: now + 11)
+    assert cache.get('a') is None
+
+
+def test_fragment_key_follows_scope_versions():
+    state = MemoryState()
+    cache, renders = FragmentCache(state), []
+
+    def render():
+        renders.append(1)
+        return f'page {len(renders)}'
+
+    etag, html, _ = cache.get_or_render('teacher:1', ['exams'], render)
+    assert cache.get_or_render('teacher:1', ['exams'], render)[:2] == (etag, html)
+    assert len(renders) == 1
+
+    cache.bump('results')                                   # a scope the page does not show
+    assert cache.get_or_render('teacher:1', ['exams'], render)[0] == etag
+    cache.bump('exams')
+    etag2, html2, _ = cache.get_or_render('teacher:1', ['exams'], render)
+    assert etag2 != etag and html2 == 'page 2'
+
+
+def test_fragment_key_includes_name_and_extra():
+    cache = FragmentCache(MemoryState())
+    keys = {cache.get_or_render(name, ['exams'], lambda: 'x', extra)[0]
+            for name, extra in [('teacher:1', ()), ('teacher:2', ()), ('teacher:1', ('page', 2))]}
+    assert len(keys) == 3
+
+
+def test_other_workers_see_a_bump_through_shared_state():
+    state = MemoryState()
+    a, b = FragmentCache(state), FragmentCache(state)
+    etag = b.get_or_render('lab', ['software'], lambda: 'x')[0]
+    a.bump('software')
+    assert b.get_or_render('lab', ['software'], lambda: 'y')[1] == 'y'
+    assert b.get_or_render('lab', ['software'], lambda: 'z')[0] != etag
+
+
+def test_dashboard_revalidates_with_304(app, exam):
+    client = login(app, 'teacher@lab', 'teacher')
+    first = client.get('/teacher/dashboard')
+    assert first.status_code == 200 and first.headers['Cache-Control'] == 'private, no-cache'
+    again = client.get('/teacher/dashboard', headers={'If-None-Match': first.headers['ETag']})
+    assert again.status_code == 304
+    appmod.page_cache.bump('exams')
+    changed = client.get('/teacher/dashboard', headers={'If-None-Match': first.headers['ETag']})
+    assert changed.status_code == 200 and changed.headers['ETag'] != first.headers['ETag']
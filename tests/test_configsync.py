@@ -0,0 +1,42 @@
+# tests/test_configsync.py
+import json
+from types import SimpleNamespace
+
+from utils.configsync import SYNC_FIELDS, diff_software, read_software_config
+
+
+def row(id, name, **fields):
+    return SimpleNamespace(id=id, name=name, **{k: fields.get(k) for k in SYNC_FIELDS})
+
+
+def entry(name, **fields):
+    return {'name': name, **{k: fields.get(k) for k in SYNC_FIELDS}}
+
+
+def test_diff_software():
+    rows = [row(1, 'gcc', cmd='gcc --version', type='cmd'),
+            row(2, 'VS Code', type='exe', url='https://old'),
+            row(3, 'Turbo C', type='exe')]
+    entries = {'gcc': entry('gcc', cmd='gcc --version', type='cmd'),
+               'VS Code': entry('VS Code', type='exe', url='https://new'),
+               'Python': entry('Python', cmd='python --version', type='cmd')}
+    inserts, updates, deletes = diff_software(entries, rows)
+    assert inserts == [dict(entries['Python'], is_installed=False)]
+    assert updates == [{'id': 2, **{k: entries['VS Code'][k] for k in SYNC_FIELDS}}]
+    assert deletes == [3]
+
+
+def test_unchanged_config_is_a_no_op():
+    rows = [row(1, 'gcc', cmd='gcc --version', type='cmd')]
+    assert diff_software({'gcc': entry('gcc', cmd='gcc --version', type='cmd')}, rows) == ([], [], [])
+
+
+def test_read_software_config(tmp_path):
+    path = tmp_path / 'config.json'
+    path.write_text(json.dumps({'softwares': [{'name': 'gcc', 'cmd': 'gcc -v', 'type': 'cmd', 'extra': 1},
+                                              {'cmd': 'nameless'},
+                                              {'name': 'gcc', 'cmd': 'gcc --version', 'type': 'cmd'}]}))
+    digest, entries = read_software_config(str(path))
+    assert len(digest) == 64
+    assert entries == {'gcc': entry('gcc', cmd='gcc --version', type='cmd')}
+    assert read_software_config(str(path))[0] == digest
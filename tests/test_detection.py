@@ -0,0 +1,32 @@
+# tests/test_detection.py
+import sys, time
+
+from utils.detection import DetectionEngine
+
+PY = f'"{sys.executable}"'
+
+
+def item(name, seconds, ok=True):
+    return {'name': name, 'type': 'cmd', 'cmd': f'{PY} -c "import time, sys; time.sleep({seconds}); sys.exit({0 if ok else 1})"'}
+
+
+def test_refresh_waits_for_every_round_of_probes():
+    stored = []
+    engine = DetectionEngine(max_workers=2, timeout=2, on_results=stored.append)
+    items = [item(f'p{n}', 0.5, ok=n % 2 == 0) for n in range(6)]   # three rounds on two threads
+    results = engine.refresh(items)
+    assert results == {f'p{n}': n % 2 == 0 for n in range(6)}
+    assert stored == [results]
+
+
+def test_unfinished_probes_are_left_out(monkeypatch):
+    engine = DetectionEngine(max_workers=1, timeout=0.2)
+    monkeypatch.setattr('utils.detection.wait', lambda futures, timeout: (set(), set(futures)))
+    assert engine.refresh([item('slow', 0)]) == {}
+
+
+def test_probe_timeout_counts_as_missing():
+    engine = DetectionEngine(max_workers=1, timeout=0.3)
+    start = time.monotonic()
+    assert engine.refresh([item('hangs', 5)]) == {'hangs': False}
+    assert time.monotonic() - start < 4
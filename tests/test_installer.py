@@ -0,0 +1,27 @@
+# tests/test_installer.py
+from utils import installer
+from utils.installer import cached_path, installer_filename
+
+
+def test_installer_filename_depends_on_the_url():
+    a = installer_filename('Code Blocks', 'https://mirror/codeblocks-20.03.exe')
+    assert a.startswith('Code_Blocks-') and a.endswith('.exe')
+    assert a == installer_filename('Code Blocks', 'https://mirror/codeblocks-20.03.exe')
+    assert a != installer_filename('Code Blocks', 'https://mirror/codeblocks-25.03.exe')
+
+
+def test_installer_filename_extension():
+    assert installer_filename('Python', 'https://x/python.msi?dl=1').endswith('.msi')
+    assert installer_filename('Tool', 'https://x/download').endswith('.exe')
+    assert installer_filename('../..', 'https://x/a.zip').startswith('installer-')
+
+
+def test_cached_path_checks_the_recorded_checksum(tmp_path, monkeypatch):
+    monkeypatch.setattr(installer, 'DOWNLOAD_DIR', str(tmp_path))
+    assert cached_path('a.exe') is None
+    (tmp_path / 'a.exe').write_bytes(b'data')
+    assert cached_path('a.exe') == str(tmp_path / 'a.exe')
+    assert cached_path('a.exe', 'ABC') is None          # no .sha256 sidecar yet
+    (tmp_path / 'a.exe.sha256').write_text('abc')
+    assert cached_path('a.exe', 'ABC') == str(tmp_path / 'a.exe')
+    assert cached_path('a.exe', 'def') is None
@@ -0,0 +1,144 @@
+# tests/test_jobqueue.py
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, update
+
+from models import QueuedJob
+from utils.jobqueue import JobQueue, JobWorker, QUEUED, RUNNING, DONE, FAILED, CANCELLED
+
+
+@pytest.fixture
+def queue(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}")
+    QueuedJob.__table__.create(engine)
+    yield JobQueue(engine, QueuedJob.__table__, retry_base=10, stale_seconds=60)
+    engine.dispose()
+
+
+def age(queue, job_id, **values):
+    with queue.engine.begin() as conn:
+        conn.execute(update(queue.table).where(queue.table.c.id == job_id).values(**values))
+
+
+def test_enqueue_with_key_returns_the_active_job(queue):
+    job, created = queue.enqueue('install', key='7')
+    again, created_again = queue.enqueue('install', key='7')
+    assert created and not created_again
+    assert again['id'] == job['id']
+
+
+def test_claim_takes_higher_priority_first_and_only_once(queue):
+    low, _ = queue.enqueue('detect')
+    high, _ = queue.enqueue('install', priority=5)
+    first = queue.claim('w1')
+    assert first['id'] == high['id'] and first['state'] == RUNNING and first['attempts'] == 1
+    assert queue.claim('w2')['id'] == low['id']
+    assert queue.claim('w3') is None
+
+
+def test_claim_filters_by_kind(queue):
+    queue.enqueue('install')
+    assert queue.claim('w1', kinds=['detect']) is None
+    assert queue.claim('w1', kinds=['install'])['kind'] == 'install'
+
+
+def test_failed_attempt_is_retried_after_backoff_then_fails(queue):
+    queue.enqueue('install', max_attempts=2)
+    job = queue.claim('w1')
+    assert queue.fail(job, 'boom', 'w1') == QUEUED
+    retried = queue.get(job['id'])
+    assert retried['error'] == 'boom' and retried['worker'] is None
+    assert retried['run_after'] > datetime.utcnow().timestamp() - 1
+    assert queue.claim('w1') is None            # still backing off
+
+    age(queue, job['id'], run_after=datetime.utcnow() - timedelta(seconds=1))
+    job = queue.claim('w1')
+    assert job['attempts'] == 2
+    assert queue.fail(job, 'boom again', 'w1') == FAILED
+    assert queue.get(job['id'])['state'] == FAILED
+
+
+def test_backoff_doubles_and_is_capped(queue):
+    assert 7.5 <= queue.backoff(1) <= 12.5
+    assert 15 <= queue.backoff(2) <= 25
+    assert queue.backoff(50) <= queue.retry_max * 1.25
+
+
+def test_failing_a_job_asked_to_cancel_cancels_it(queue):
+    queue.enqueue('install')
+    job = queue.claim('w1')
+    assert queue.cancel(job['id'])
+    assert queue.fail(job, 'interrupted', 'w1') == CANCELLED
+    assert queue.get(job['id'])['state'] == CANCELLED
+
+
+def test_finish_and_fail_only_for_the_worker_holding_the_job(queue):
+    queue.enqueue('install', max_attempts=1)
+    job = queue.claim('w1')
+    assert not queue.finish(job['id'], DONE, 'w2', result={'ok': True})
+    assert queue.fail(job, 'boom', 'w2') is None
+    assert queue.get(job['id'])['state'] == RUNNING
+    assert queue.finish(job['id'], DONE, 'w1', result={'ok': True})
+    done = queue.get(job['id'])
+    assert done['state'] == DONE and done['result'] == {'ok': True} and done['progress'] == 100
+    assert not queue.finish(job['id'], FAILED, 'w1')
+
+
+def test_recover_requeues_jobs_without_heartbeat(queue):
+    queue.enqueue('install')
+    job = queue.claim('w1')
+    assert queue.recover() == 0
+    age(queue, job['id'], heartbeat_at=datetime.utcnow() - timedelta(seconds=120))
+    assert queue.recover() == 1
+    recovered = queue.get(job['id'])
+    assert recovered['state'] == QUEUED and recovered['worker'] is None
+    assert 'w1 stopped responding' in recovered['error']
+    # the stopped worker must not overwrite what happens to the job next
+    assert not queue.finish(job['id'], DONE, 'w1')
+
+
+def test_recover_fails_jobs_out_of_attempts(queue):
+    queue.enqueue('install', max_attempts=1)
+    job = queue.claim('w1')
+    age(queue, job['id'], heartbeat_at=datetime.utcnow() - timedelta(seconds=120))
+    queue.recover()
+    assert queue.get(job['id'])['state'] == FAILED
+
+
+def test_heartbeat_reports_cancel_request(queue):
+    queue.enqueue('install')
+    job = queue.claim('w1')
+    assert not queue.heartbeat(job['id'], 'w1', 40)
+    queue.cancel(job['id'])
+    assert queue.heartbeat(job['id'], 'w1', 50)
+    assert queue.get(job['id'])['progress'] == 50
+
+
+def test_cancel_and_retry(queue):
+    job, _ = queue.enqueue('install')
+    assert queue.cancel(job['id'])
+    assert queue.get(job['id'])['state'] == CANCELLED
+    assert not queue.cancel(job['id'])
+    assert queue.retry(job['id'])
+    retried = queue.get(job['id'])
+    assert retried['state'] == QUEUED and retried['attempts'] == 0
+
+
+def test_worker_runs_handlers_and_records_outcome(queue):
+    def broken(ctx):
+        raise RuntimeError('no network')
+
+    ok, _ = queue.enqueue('detect', payload={'n': 2})
+    bad, _ = queue.enqueue('install', max_attempts=1)
+    worker = JobWorker(queue, {'detect': lambda ctx: {'double': ctx.payload['n'] * 2}, 'install': broken},
+                       threads=2, poll=0.05)
+    worker.start()
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline and queue.list(state=RUNNING) + queue.list(state=QUEUED):
+        time.sleep(0.05)
+    worker.stop()
+    assert queue.get(ok['id'])['result'] == {'double': 4}
+    failed = queue.get(bad['id'])
+    assert failed['state'] == FAILED and failed['error'] == 'no network'
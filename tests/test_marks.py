@@ -0,0 +1,80 @@
+# tests/test_marks.py
+import io
+
+import pytest
+
+from app import apply_marks
+from models import db, Submission
+from conftest import login
+
+
+@pytest.fixture
+def submissions(exam, make_user):
+    subs = []
+    for n, roll in enumerate(['R1', 'R2', 'R2', None], 1):
+        student = make_user(f'student{n}', roll=roll)
+        sub = Submission(exam_id=exam.id, student_id=student.id, file_name=f'main{n}.c')
+        db.session.add(sub)
+        subs.append(sub)
+    db.session.commit()
+    return subs
+
+
+def marks():
+    return {s.id: s.mark for s in Submission.query.order_by(Submission.id)}
+
+
+def test_marks_by_submission_id_and_roll(exam, submissions):
+    a, b, c, d = submissions
+    updated, errors = apply_marks(exam, [{'submission_id': a.id, 'mark': '7.5'},
+                                         {'roll': 'R1', 'mark': 9},          # same submission, later row wins
+                                         {'submission_id': str(d.id), 'mark': 0}])
+    assert (updated, errors) == (2, [])
+    assert marks() == {a.id: 9, b.id: None, c.id: None, d.id: 0}
+
+
+def test_bad_rows_are_reported_and_skipped(exam, submissions):
+    a = submissions[0]
+    updated, errors = apply_marks(exam, [
+        {'submission_id': a.id, 'mark': 'ten'},
+        {'submission_id': a.id, 'mark': -1},
+        {'submission_id': a.id, 'mark': 'nan'},
+        {'submission_id': 999, 'mark': 5},
+        {'roll': 'R2', 'mark': 5},                  # two students share the roll
+        {'roll': 'R9', 'mark': 5},
+        {'mark': 5},
+        'not a row',
+        {'submission_id': a.id, 'mark': 6},
+    ])
+    assert updated == 1
+    assert [e['row'] for e in errors] == [1, 2, 3, 4, 5, 6, 7, 8]
+    assert 'matches 2 submissions' in errors[4]['message']
+    assert marks()[a.id] == 6
+
+
+def test_only_this_exams_submissions(exam, submissions, make_user):
+    from models import Exam
+    other = Exam(title='Lab 2', description='', duration_minutes=30, teacher_id=exam.teacher_id)
+    db.session.add(other)
+    db.session.commit()
+    updated, errors = apply_marks(other, [{'submission_id': submissions[0].id, 'mark': 5}])
+    assert updated == 0 and len(errors) == 1
+
+
+def test_csv_upload_endpoint(app, exam, submissions):
+    a, _, _, d = submissions
+    client = login(app, 'teacher@lab', 'teacher')
+    csv = f'Submission_ID,Mark\n{a.id},4\n{d.id},x\n'.encode('utf-8-sig')
+    response = client.post(f'/teacher/marks/{exam.id}', data={'file': (io.BytesIO(csv), 'marks.csv')},
+                           content_type='multipart/form-data')
+    body = response.get_json()
+    assert body['status'] == 'success' and body['updated'] == 1 and body['errors'][0]['row'] == 2
+    db.session.expire_all()
+    assert marks()[a.id] == 4
+
+
+def test_endpoint_is_for_teachers_only(app, exam, submissions):
+    client = login(app, 'student1@lab', 'student')
+    response = client.post(f'/teacher/marks/{exam.id}', json=[{'submission_id': submissions[0].id, 'mark': 5}])
+    assert response.get_json()['status'] == 'error'
+    assert marks()[submissions[0].id] is None
@@ -0,0 +1,58 @@
+# tests/test_migrations.py
+import pytest
+from sqlalchemy import create_engine, inspect, text
+
+from utils.migrations import DuplicateSubmissions, upgrade
+
+# the submission / fingerprint tables as they were before the unique index
+OLD_SCHEMA = [
+    'CREATE TABLE submission (id INTEGER PRIMARY KEY, exam_id INTEGER, student_id INTEGER, '
+    'file_name VARCHAR(255), code TEXT, mark FLOAT, submitted_at DATETIME)',
+    'CREATE TABLE fingerprint (id INTEGER PRIMARY KEY, hash INTEGER NOT NULL, '
+    'submission_id INTEGER NOT NULL, exam_id INTEGER)',
+]
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with engine.begin() as conn:
+        for ddl in OLD_SCHEMA:
+            conn.execute(text(ddl))
+        conn.execute(text('INSERT INTO submission (id, exam_id, student_id, file_name, mark) VALUES '
+                          '(1, 1, 10, "a.py", 8), (2, 1, 10, "b.py", NULL), '     # marked, then resubmitted
+                          '(3, 1, 11, "c.py", 5), (4, 1, 11, "d.py", 7), '        # both marked
+                          '(5, 2, 10, "e.py", NULL)'))
+        conn.execute(text('INSERT INTO fingerprint (hash, submission_id, exam_id) VALUES '
+                          '(100, 1, 1), (101, 2, 1), (102, 3, 1), (103, 4, 1), (104, 5, 2)'))
+    yield engine
+    engine.dispose()
+
+
+def rows(engine, sql):
+    with engine.connect() as conn:
+        return conn.execute(text(sql)).all()
+
+
+def test_upgrade_refuses_to_delete_duplicates(engine):
+    with pytest.raises(DuplicateSubmissions, match='2 student'):
+        upgrade(engine)
+    assert len(rows(engine, 'SELECT id FROM submission')) == 5
+    assert 'uq_submission_exam_student' not in {i['name'] for i in inspect(engine).get_indexes('submission')}
+
+
+def test_dedupe_keeps_newest_and_a_mark(engine, capsys):
+    upgrade(engine, dedupe=True)
+    assert rows(engine, 'SELECT id, mark FROM submission ORDER BY id') == [(2, 8), (4, 7), (5, None)]
+    assert [r.submission_id for r in rows(engine, 'SELECT submission_id FROM fingerprint ORDER BY id')] == [2, 4, 5]
+    assert 'uq_submission_exam_student' in {i['name'] for i in inspect(engine).get_indexes('submission')}
+    out = capsys.readouterr().out
+    assert 'removing submission 1 ' in out and 'removing submission 3 ' in out
+    assert 'kept mark 8.0' in out
+
+
+def test_upgrade_is_a_no_op_the_second_time(engine):
+    upgrade(engine, dedupe=True)
+    upgrade(engine)
+    assert len(rows(engine, 'SELECT id FROM submission')) == 3
+    assert 'content_hash' in {c['name'] for c in inspect(engine).get_columns('submission')}
@@ -0,0 +1,123 @@
+# tests/test_similarity.py
+import io, re
+
+import app as appmod
+from app import index_submission, similarity_report
+from models import db, Fingerprint, Submission
+from utils.jobqueue import JobContext
+from utils.similarity import fingerprints, score, tokenize
+from conftest import login
+
+SOURCE = '''
+#include <stdio.h>
+/* sum of the first n numbers */
+int main() {
+    int n, i, total = 0;
+    scanf("%d", &n);
+    for (i = 1; i <= n; i++) {
+        total += i;      // running sum
+    }
+    printf("%d\\n", total);
+    return 0;
+}
+'''
+
+RENAMED = '''
+#include <stdio.h>
+int main() {
+    int count, k, acc = 0;
+    scanf("%d", &count);
+    for (k = 1; k <= count; k++) {
+        acc += k;
+    }
+    printf("sum=%d\\n", acc);
+    return 0;
+}
+'''
+
+OTHER = '''
+int fib(int n) { return n < 2 ? n : fib(n - 1) + fib(n - 2); }
+int main() { int x; scanf("%d", &x); while (x > 0) { printf("%d ", fib(x)); x--; } return 0; }
+'''
+
+
+def test_tokenize_normalizes_names_literals_and_comments():
+    assert tokenize('int total = 42; // note\nchar *s = "hi";') == \
+        ['int', 'V', '=', 'N', ';', 'char', '*', 'V', '=', 'S', ';']
+    assert tokenize('#include <stdio.h>\n/* x */') == []
+
+
+def test_renaming_does_not_change_fingerprints():
+    assert fingerprints(SOURCE) == fingerprints(RENAMED)
+    assert all(0 <= h < 2 ** 31 for h in fingerprints(SOURCE))
+
+
+def test_unrelated_code_shares_little():
+    a, b = fingerprints(SOURCE), fingerprints(OTHER)
+    assert score(len(a & b), len(a), len(b)) < 0.2
+
+
+def test_short_sources():
+    assert fingerprints('int x;') == set()
+    assert len(fingerprints('int main ( ) { return 0 ; } int x ;', k=12, window=8)) == 1
+
+
+def test_score():
+    assert score(5, 10, 5) == 1.0
+    assert score(2, 4, 8) == 0.5
+    assert score(0, 0, 7) == 0.0
+
+
+# every solution starts from the skeleton the exam handed out
+SKELETON = '''
+#include <stdio.h>
+int read_int() { int x; if (scanf("%d", &x) != 1) return 0; return x; }
+void print_int(int x) { printf("%d\\n", x); }
+int main() {
+    int n = read_int();
+    int result = solve(n);
+    print_int(result);
+    return 0;
+}
+'''
+
+BODIES = [
+    'int solve(int n) { int s = 0; for (int i = 1; i <= n; i++) { if (i % 3 == 0 || i % 5 == 0) s += i; } return s; }',
+    'int solve(int n) { int a = 0, b = 1; while (n-- > 0) { int t = a + b; a = b; b = t; } return a; }',
+    'int solve(int n) { int c = 0; while (n) { c += n & 1; n >>= 1; } return c * c - 1; }',
+]
+
+
+def test_report_ignores_boilerplate_shared_by_the_exam(app, exam, make_user):
+    sources = [BODIES[0] + SKELETON, re.sub(r'\bs\b', 'total', BODIES[0]) + SKELETON,   # a copied pair
+               BODIES[1] + SKELETON, BODIES[2] + SKELETON]
+    subs = []
+    for n, code in enumerate(sources):
+        sub = Submission(exam_id=exam.id, student_id=make_user(f's{n}').id, code=code)
+        db.session.add(sub)
+        db.session.flush()
+        index_submission(sub)
+        subs.append(sub)
+    db.session.commit()
+
+    pairs = similarity_report(exam.id, threshold=0.5)
+    assert [(p['a']['submission_id'], p['b']['submission_id']) for p in pairs] == [(subs[0].id, subs[1].id)]
+    assert pairs[0]['score'] == 1.0
+    # without the cutoff the shared skeleton makes every pair look copied
+    assert len(similarity_report(exam.id, threshold=0.5, max_share=1.0)) > 1
+
+
+def test_submit_queues_indexing_instead_of_doing_it(app, exam, make_user):
+    make_user('carol')
+    client = login(app, 'carol@lab', 'student')
+    response = client.post('/submit_exam', data={'exam_id': str(exam.id), 'software': 'gcc',
+                                                 'file': (io.BytesIO((BODIES[0] + SKELETON).encode()), 'main.c')},
+                           content_type='multipart/form-data')
+    assert response.get_json()['status'] == 'success'
+    assert Fingerprint.query.count() == 0
+
+    job = appmod.job_queue.claim('test', kinds=['index'])
+    assert job['payload']['submission_id'] == Submission.query.one().id
+    ctx = JobContext(job, None)
+    assert appmod.index_job(ctx)['fingerprints'] > 0
+    assert Fingerprint.query.count() > 0
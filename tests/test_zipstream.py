@@ -0,0 +1,57 @@
+# tests/test_zipstream.py
+import io, os, zipfile
+
+import app as appmod
+from utils.zipstream import stream_zip
+from models import db, Submission
+from conftest import login
+
+
+def test_stream_zip_round_trip(tmp_path):
+    big = os.urandom(300 * 1024)               # several chunks, incompressible
+    path = tmp_path / 'main.c'
+    path.write_bytes(big)
+    chunks = list(stream_zip([('marks.csv', None, b'roll,mark\nR1,9\n'), ('R1/main.c', str(path), None)],
+                             chunk_size=64 * 1024))
+    assert len(chunks) > 3
+    assert max(len(c) for c in chunks[:-1]) < 100 * 1024     # never the whole archive at once
+    with zipfile.ZipFile(io.BytesIO(b''.join(chunks))) as zf:
+        assert zf.testzip() is None
+        assert zf.namelist() == ['marks.csv', 'R1/main.c']
+        assert zf.read('marks.csv') == b'roll,mark\nR1,9\n'
+        assert zf.read('R1/main.c') == big
+
+
+def test_stream_zip_is_lazy():
+    opened = []
+
+    def entries():
+        for n in range(3):
+            opened.append(n)
+            yield f'f{n}.txt', None, b'x' * 10
+
+    stream = stream_zip(entries())
+    next(stream)
+    assert opened == [0]
+
+
+def test_empty_zip():
+    with zipfile.ZipFile(io.BytesIO(b''.join(stream_zip([])))) as zf:
+        assert zf.namelist() == []
+
+
+def test_exam_export(app, exam, make_user):
+    student = make_user('alice', roll='R7')
+    blob, _ = appmod.blob_store.put(io.BytesIO(b'int main(){}'))
+    db.session.add(Submission(exam_id=exam.id, student_id=student.id, file_name='2_1_1700000000_main.c',
+                              content_hash=blob, mark=8))
+    db.session.add(Submission(exam_id=exam.id, student_id=make_user('bob').id, code='print(1)'))
+    db.session.commit()
+    response = login(app, 'teacher@lab', 'teacher').get(f'/teacher/export/{exam.id}')
+    assert response.mimetype == 'application/zip'
+    with zipfile.ZipFile(io.BytesIO(response.get_data())) as zf:
+        names = zf.namelist()
+        assert names[0] == 'marks.csv'
+        assert sorted(names[1:]) == ['Bob/submission.txt', 'R7_Alice/main.c']
+        assert zf.read('R7_Alice/main.c') == b'int main(){}'
+        assert 'R7,Alice,alice' in zf.read('marks.csv').decode()
@@ -0,0 +1,126 @@
+# utils/assets.py
+import os, re, json, gzip, hashlib
+try:
+    import brotli
+except ImportError:   # .br variants are skipped, gzip still works
+    brotli = None
+
+# third-party files the templates use; `flask assets-build --vendor` stores
+# them under static/vendor/, until then asset_url() points at the CDN
+VENDOR_ASSETS = {
+    'vendor/bootstrap.min.css': 'https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css',
+    'vendor/bootstrap.bundle.min.js': 'https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/js/bootstrap.bundle.min.js',
+    'vendor/jquery.min.js': 'https://code.jquery.com/jquery-3.7.0.min.js',
+}
+SOURCE_DIRS = ('css', 'js', 'vendor')
+MANIFEST = 'manifest.json'
+
+def minify_css(text):
+    text = re.sub(r'/\*.*?\*/', '', text, flags=re.S)
+    text = re.sub(r'\s+', ' ', text)
+    text = re.sub(r'\s*([{};,>])\s*', r'\1', text)
+    text = re.sub(r':\s+', ':', text)
+    return text.replace(';}', '}').strip()
+
+def minify_js(text):
+    """
+    Conservative: drops indentation, blank lines and whole-line // comments
+    but keeps every line break, so automatic semicolon insertion and string
+    contents are untouched. gzip / brotli take care of the rest.
+    """
+    lines = (line.strip() for line in text.splitlines())
+    return '\n'.join(line for line in lines if line and not line.startswith('//')) + '\n'
+
+def minify(name, data):
+    if '.min.' in name:
+        return data
+    if name.endswith('.css'):
+        return minify_css(data.decode('utf-8')).encode('utf-8')
+    if name.endswith('.js'):
+        return minify_js(data.decode('utf-8')).encode('utf-8')
+    return data
+
+def hashed_name(name, data):
+    root, ext = os.path.splitext(name)
+    return f'{root}.{hashlib.sha256(data).hexdigest()[:12]}{ext}'
+
+def _write(path, data):
+    if os.path.exists(path):        # content-hashed: same name, same bytes
+        return
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+def load_manifest(out_dir):
+    """{source name: hashed name} of the last build, {} if there is none."""
+    try:
+        with open(os.path.join(out_dir, MANIFEST), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def build_assets(static_dir, out_dir):
+    """
+    Minify every CSS / JS file under static/{css,js,vendor}, write it to
+    out_dir under a content-hashed name with .gz (and .br when brotli is
+    installed) next to it, and replace the manifest. Files of the previous
+    build are kept for workers still serving it; older ones are removed.
+    Returns the new manifest.
+    """
+    manifest = {}
+    for sub in SOURCE_DIRS:
+        src_dir = os.path.join(static_dir, sub)
+        if not os.path.isdir(src_dir):
+            continue
+        for root, _, files in os.walk(src_dir):
+            for filename in sorted(files):
+                if not filename.endswith(('.css', '.js')):
+                    continue
+                path = os.path.join(root, filename)
+                name = os.path.relpath(path, static_dir).replace(os.sep, '/')
+                with open(path, 'rb') as f:
+                    data = minify(name, f.read())
+                target = hashed_name(name, data)
+                out = os.path.join(out_dir, target)
+                _write(out, data)
+                gz = gzip.compress(data, compresslevel=9, mtime=0)
+                if len(gz) < len(data):
+                    _write(out + '.gz', gz)
+                if brotli:
+                    br = brotli.compress(data, quality=11)
+                    if len(br) < len(data):
+                        _write(out + '.br', br)
+                manifest[name] = target
+
+    keep = set(manifest.values()) | set(load_manifest(out_dir).values())
+    _write_manifest(out_dir, manifest)
+    for root, _, files in os.walk(out_dir):
+        for filename in files:
+            rel = os.path.relpath(os.path.join(root, filename), out_dir).replace(os.sep, '/')
+            if rel == MANIFEST:
+                continue
+            if re.sub(r'\.(gz|br)$', '', rel) not in keep:
+                os.remove(os.path.join(root, filename))
+    return manifest
+
+def _write_manifest(out_dir, manifest):
+    os.makedirs(out_dir, exist_ok=True)
+    path = os.path.join(out_dir, MANIFEST)
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(path + '.tmp', path)
+
+def fetch_vendor_assets(static_dir, session, timeout=30):
+    """Download VENDOR_ASSETS into static/vendor/ so the lab never waits on a CDN. Returns the names fetched."""
+    fetched = []
+    for name, url in VENDOR_ASSETS.items():
+        r = session.get(url, timeout=timeout)
+        r.raise_for_status()
+        path = os.path.join(static_dir, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(r.content)
+        fetched.append(name)
+    return fetched
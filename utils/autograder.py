@@ -0,0 +1,168 @@
+# utils/autograder.py
+import os, time, shutil, signal, tempfile, subprocess
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import resource            # POSIX only; on Windows we fall back to timeouts
+except ImportError:
+    resource = None
+
+DEFAULT_LIMITS = {
+    'compile_timeout': 20,     # seconds for gcc
+    'time': 2,                 # wall-clock seconds per test case
+    'cpu': 2,                  # CPU seconds per test case
+    'memory_mb': 256,          # address space per test case
+    'output_kb': 1024,         # max bytes a program may write to files / stdout
+    'processes': 32,           # RLIMIT_NPROC: stops fork bombs
+}
+
+# --------------------------------------------------
+# Sandbox helpers
+# --------------------------------------------------
+def _limit_child(limits, user=None):
+    """
+    Build a preexec_fn that applies rlimits inside the forked child and, with
+    `user` = (uid, gid), drops to that account (needs the server to run as root).
+    """
+    if resource is None:
+        return None
+
+    def apply():
+        cpu = int(limits['cpu'])
+        mem = int(limits['memory_mb']) * 1024 * 1024
+        out = int(limits['output_kb']) * 1024 + 1     # one byte over the limit marks the case
+        nproc = int(limits['processes'])
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu, cpu + 1))
+        resource.setrlimit(resource.RLIMIT_AS, (mem, mem))
+        resource.setrlimit(resource.RLIMIT_FSIZE, (out, out))
+        resource.setrlimit(resource.RLIMIT_CORE, (0, 0))
+        resource.setrlimit(resource.RLIMIT_NPROC, (nproc, nproc))
+        if user:
+            os.setgroups([])
+            os.setgid(user[1])
+            os.setuid(user[0])
+    return apply
+
+def _kill_group(p):
+    """Kill the test program and everything it started (its own session / process group)."""
+    try:
+        if os.name == 'posix':
+            os.killpg(p.pid, signal.SIGKILL)
+        else:
+            p.kill()
+    except (ProcessLookupError, PermissionError, OSError):
+        pass
+    p.wait()
+
+def _normalize_output(text):
+    lines = [line.rstrip() for line in text.replace('\r\n', '\n').split('\n')]
+    while lines and not lines[-1]:
+        lines.pop()
+    return '\n'.join(lines)
+
+def compile_source(source_path, workdir, cc='gcc', timeout=20):
+    """Compile a C file into workdir. Returns (exe_path or None, compiler output)."""
+    exe = os.path.join(workdir, 'prog.exe' if os.name == 'nt' else 'prog')
+    try:
+        p = subprocess.run([cc, '-O2', '-std=gnu11', '-o', exe, '-x', 'c', source_path, '-x', 'none', '-lm'],
+                           stdout=subprocess.PIPE, stderr=subprocess.STDOUT, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return None, 'compilation timed out'
+    except OSError as e:
+        return None, f'compiler not available: {e}'
+    output = p.stdout.decode(errors='ignore')
+    return (exe if p.returncode == 0 else None), output
+
+def run_case(exe, input_data, workdir, limits, sandbox=(), user=None):
+    """
+    Run one test case. Returns (status, stdout). `sandbox` is a command
+    prefix such as ['unshare', '--net', '--map-root-user'] (no network);
+    `user` = (uid, gid) runs the program as that account. stdout goes to a
+    temp file, where RLIMIT_FSIZE stops it at output_kb (a pipe would
+    buffer whatever the program writes until it exits).
+    """
+    max_out = int(limits['output_kb']) * 1024
+    extra = {'start_new_session': True, 'preexec_fn': _limit_child(limits, user)} if os.name == 'posix' else {}
+    with tempfile.TemporaryFile(dir=workdir) as out:
+        p = subprocess.Popen(list(sandbox) + [exe], cwd=workdir, stdin=subprocess.PIPE,
+                             stdout=out, stderr=subprocess.DEVNULL,
+                             env={'PATH': os.environ.get('PATH', '')}, **extra)
+        deadline = time.monotonic() + limits['time']
+        stdin = (input_data or '').encode()
+        try:
+            while True:
+                try:
+                    p.communicate(stdin, timeout=min(0.1, max(0.0, deadline - time.monotonic())))
+                    break
+                except subprocess.TimeoutExpired:
+                    stdin = None        # already being fed; communicate() resumes
+                    # rlimits do not exist on Windows, so the size is watched here as well
+                    if os.fstat(out.fileno()).st_size > max_out:
+                        return 'output_limit', ''
+                    if time.monotonic() >= deadline:
+                        return 'timeout', ''
+        finally:
+            # also reaps children left in the background, which would outlive a plain kill()
+            _kill_group(p)
+        if os.fstat(out.fileno()).st_size > max_out:
+            return 'output_limit', ''
+        out.seek(0)
+        stdout = out.read().decode(errors='ignore')
+    if p.returncode != 0:
+        return 'runtime_error', stdout
+    return 'ok', stdout
+
+# --------------------------------------------------
+# Worker entry point (must stay top-level so it can be pickled)
+# --------------------------------------------------
+def grade_submission(job):
+    """
+    job = {'submission_id', 'source_path' or 'code', 'cases': [(input, expected, points)],
+           'limits': {...}, 'cc': 'gcc', 'sandbox': [...], 'user': (uid, gid) or None}
+    Returns {'submission_id', 'score', 'total', 'passed', 'compiled', 'error'}.
+    """
+    limits = dict(DEFAULT_LIMITS, **(job.get('limits') or {}))
+    cases = job.get('cases') or []
+    result = {'submission_id': job['submission_id'], 'score': 0.0,
+              'total': float(sum(c[2] for c in cases)), 'passed': 0,
+              'compiled': False, 'error': None}
+    workdir = tempfile.mkdtemp(prefix='grade_')
+    try:
+        source = job.get('source_path')
+        if not source or not os.path.exists(source):
+            if not job.get('code'):
+                result['error'] = 'submission file not found'
+                return result
+            source = os.path.join(workdir, 'main.c')
+            with open(source, 'w', encoding='utf-8') as f:
+                f.write(job['code'])
+        exe, output = compile_source(source, workdir, job.get('cc', 'gcc'), limits['compile_timeout'])
+        if not exe:
+            result['error'] = output[-2000:] or 'compilation failed'
+            return result
+        result['compiled'] = True
+        user = job.get('user')
+        if user:
+            # the test account must reach the program, nothing else in workdir is its own
+            os.chmod(workdir, 0o711)
+            os.chmod(exe, 0o755)
+        for input_data, expected, points in cases:
+            status, stdout = run_case(exe, input_data, workdir, limits, job.get('sandbox') or (), user)
+            if status == 'ok' and _normalize_output(stdout) == _normalize_output(expected or ''):
+                result['passed'] += 1
+                result['score'] += points
+            elif status != 'ok' and not result['error']:
+                result['error'] = status
+        return result
+    except Exception as e:
+        result['error'] = str(e)
+        return result
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+def grade_many(jobs, max_workers=None):
+    """Grade every job in parallel across all cores. Returns a list of results."""
+    if not jobs:
+        return []
+    with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as pool:
+        return list(pool.map(grade_submission, jobs))
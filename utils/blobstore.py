@@ -0,0 +1,136 @@
+# utils/blobstore.py
+import os, time, hashlib, tempfile
+
+class BlobTooLarge(Exception):
+    """Raised while writing once a blob grows past its size limit."""
+
+class BlobStore:
+    """
+    Content-addressed file store. Every blob lives at root/<aa>/<sha256>,
+    so identical uploads are stored once no matter how often they arrive.
+    """
+
+    def __init__(self, root, chunk_size=64 * 1024):
+        self.root = root
+        self.chunk_size = chunk_size
+        self.tmp_dir = os.path.join(root, 'tmp')
+        os.makedirs(self.tmp_dir, exist_ok=True)
+
+    def path(self, digest):
+        return os.path.join(self.root, digest[:2], digest)
+
+    def exists(self, digest):
+        return bool(digest) and os.path.exists(self.path(digest))
+
+    def writer(self, max_size=None):
+        return BlobWriter(self, max_size)
+
+    def put(self, stream, max_size=None):
+        """
+        Copy a binary stream into the store, hashing it in the same pass.
+        Returns (sha256 hex digest, size in bytes).
+        """
+        w = self.writer(max_size)
+        try:
+            while True:
+                chunk = stream.read(self.chunk_size)
+                if not chunk:
+                    break
+                w.write(chunk)
+            return w.commit(), w.size
+        finally:
+            w.close()
+
+    def put_file(self, path):
+        with open(path, 'rb') as f:
+            return self.put(f)
+
+    def _commit(self, tmp, digest):
+        dest = self.path(digest)
+        if os.path.exists(dest):
+            os.remove(tmp)
+            os.utime(dest)          # keep a freshly referenced blob out of the GC grace window
+        else:
+            os.makedirs(os.path.dirname(dest), exist_ok=True)
+            os.replace(tmp, dest)
+        return digest
+
+    def iter_digests(self):
+        for prefix in os.listdir(self.root):
+            folder = os.path.join(self.root, prefix)
+            if prefix == 'tmp' or not os.path.isdir(folder):
+                continue
+            for name in os.listdir(folder):
+                yield name
+
+    def gc(self, referenced, grace_seconds=3600):
+        """
+        Delete blobs whose digest is not in `referenced`. Blobs modified within
+        the grace window are kept so uploads that are not committed yet survive.
+        Returns (deleted count, freed bytes).
+        """
+        referenced = set(referenced)
+        cutoff = time.time() - grace_seconds
+        deleted = freed = 0
+        for digest in list(self.iter_digests()):
+            if digest in referenced:
+                continue
+            path = self.path(digest)
+            try:
+                st = os.stat(path)
+                if st.st_mtime > cutoff:
+                    continue
+                os.remove(path)
+                deleted += 1
+                freed += st.st_size
+            except OSError:
+                continue
+        for name in os.listdir(self.tmp_dir):       # leftovers of interrupted uploads
+            path = os.path.join(self.tmp_dir, name)
+            try:
+                if os.stat(path).st_mtime <= cutoff:
+                    os.remove(path)
+            except OSError:
+                continue
+        return deleted, freed
+
+
+class BlobWriter:
+    """
+    Temp file inside the store that hashes everything written to it and
+    refuses to grow past max_size. commit() moves it into place atomically;
+    close() without commit() throws the data away.
+    """
+
+    def __init__(self, store, max_size=None):
+        self.store = store
+        self.max_size = max_size
+        self.size = 0
+        self.digest = None
+        self._hash = hashlib.sha256()
+        fd, self.tmp = tempfile.mkstemp(dir=store.tmp_dir)
+        self._file = os.fdopen(fd, 'w+b')
+
+    def write(self, data):
+        self.size += len(data)
+        if self.max_size is not None and self.size > self.max_size:
+            self.close()            # the parser that owns us may never get to clean up
+            raise BlobTooLarge(f'upload exceeds {self.max_size} bytes')
+        self._hash.update(data)
+        return self._file.write(data)
+
+    def __getattr__(self, name):
+        # read / seek / tell / flush go straight to the temp file
+        return getattr(self._file, name)
+
+    def commit(self):
+        if self.digest is None:
+            self._file.close()
+            self.digest = self.store._commit(self.tmp, self._hash.hexdigest())
+        return self.digest
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+        if self.digest is None and os.path.exists(self.tmp):
+            os.remove(self.tmp)
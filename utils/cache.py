@@ -0,0 +1,90 @@
+# utils/cache.py
+import time, threading, hashlib, uuid
+from collections import OrderedDict
+
+class TTLCache:
+    """
+    Small thread-safe in-process cache. Entries expire `ttl` seconds after
+    they were stored; invalidate() drops one key, clear() drops everything.
+    With maxsize set, the least recently used entry is evicted first.
+    """
+
+    _MISSING = object()
+
+    def __init__(self, ttl=60, maxsize=None):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._data = OrderedDict()  # key -> (value, expires_at), least recently used first
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            if entry[1] <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return entry[0]
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+            if self.maxsize is not None:
+                while len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+        return value
+
+    def get_or_set(self, key, factory):
+        """Return the cached value, computing and storing it with factory() on a miss."""
+        value = self.get(key, self._MISSING)
+        if value is self._MISSING:
+            value = self.set(key, factory())
+        return value
+
+    def invalidate(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+class FragmentCache:
+    """
+    Rendered fragments keyed by the versions of the data they show. Writers
+    bump() a scope (e.g. 'exams') in `state` - shared between workers when it
+    is a DatabaseState - and readers build their key from the current
+    versions, so a change is seen everywhere without deleting anything.
+    """
+
+    def __init__(self, state, ttl=600, maxsize=2000):
+        self.state = state
+        self._fragments = TTLCache(ttl=ttl, maxsize=maxsize)
+
+    def versions(self, scopes):
+        values = self.state.get_many(['fragment:' + s for s in scopes])
+        return [values.get('fragment:' + s, 0) for s in scopes]
+
+    def bump(self, *scopes):
+        token = uuid.uuid4().hex[:12]
+        for scope in scopes:
+            self.state.set('fragment:' + scope, token)
+
+    def get_or_render(self, name, scopes, render, extra=()):
+        """
+        (etag, fragment, rendered_at) for `name` at the current versions of
+        `scopes`; `extra` adds anything else the fragment depends on.
+        render() only runs on a miss.
+        """
+        versions = self.versions(scopes)
+        etag = hashlib.sha1(repr((name, versions, tuple(extra))).encode()).hexdigest()
+        entry = self._fragments.get(etag)
+        if entry is None:
+            entry = self._fragments.set(etag, (render(), time.time()))
+        return etag, entry[0], entry[1]
+
+    def clear(self):
+        self._fragments.clear()
@@ -0,0 +1,60 @@
+# utils/configsync.py
+import os, json, time, hashlib, threading
+
+# config.json fields copied onto Software rows (is_installed is owned by detection)
+SYNC_FIELDS = ('path_windows', 'cmd', 'type', 'url', 'sha256')
+
+def read_software_config(path):
+    """Returns (sha256 of the file, {name: entry}). Later duplicates of a name win."""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    entries = {}
+    for s in json.loads(raw).get('softwares', []):
+        if isinstance(s, dict) and s.get('name'):
+            entries[s['name']] = {'name': s['name'], **{k: s.get(k) for k in SYNC_FIELDS}}
+    return hashlib.sha256(raw).hexdigest(), entries
+
+def diff_software(entries, rows):
+    """
+    Compare config entries with existing rows (id, name and SYNC_FIELDS).
+    Returns (insert dicts, update dicts with id, ids to delete).
+    """
+    existing = {r.name: r for r in rows}
+    inserts, updates = [], []
+    for name, entry in entries.items():
+        row = existing.get(name)
+        if row is None:
+            inserts.append(dict(entry, is_installed=False))
+        elif any(getattr(row, k) != entry[k] for k in SYNC_FIELDS):
+            updates.append({'id': row.id, **{k: entry[k] for k in SYNC_FIELDS}})
+    deletes = [r.id for name, r in existing.items() if name not in entries]
+    return inserts, updates, deletes
+
+class FileWatcher:
+    """Tells whether a file changed since the last call, with at most one stat() per interval."""
+
+    def __init__(self, path, interval=5):
+        self.path = path
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._checked = 0
+        self._signature = None
+
+    def changed(self):
+        """True on the first check and whenever mtime / size moved since the previous one."""
+        now = time.monotonic()
+        if now - self._checked < self.interval or not self._lock.acquire(blocking=False):
+            return False
+        try:
+            self._checked = now
+            try:
+                st = os.stat(self.path)
+            except OSError:
+                return False
+            signature = (st.st_mtime_ns, st.st_size)
+            if signature == self._signature:
+                return False
+            self._signature = signature
+            return True
+        finally:
+            self._lock.release()
@@ -0,0 +1,51 @@
+# utils/dbcopy.py
+from sqlalchemy import create_engine, inspect, select, func, text
+
+def copy_database(source_url, target_url, metadata, batch_size=1000, log=print):
+    """
+    Stream every table of `metadata` from source to target in foreign-key
+    order, `batch_size` rows per INSERT, without loading a table into memory.
+    Tables that already contain rows on the target are skipped.
+    Returns {table name: rows copied}.
+    """
+    src = create_engine(source_url)
+    dst = create_engine(target_url)
+    metadata.create_all(dst)
+    src_insp = inspect(src)
+    copied = {}
+    try:
+        for table in metadata.sorted_tables:
+            if not src_insp.has_table(table.name):
+                continue
+            with dst.connect() as conn:
+                if conn.execute(select(func.count()).select_from(table)).scalar():
+                    log(f"skip {table.name}: target already has rows")
+                    continue
+            src_columns = {c['name'] for c in src_insp.get_columns(table.name)}
+            columns = [c for c in table.columns if c.name in src_columns]
+            total = 0
+            with src.connect() as s_conn:
+                result = s_conn.execution_options(stream_results=True, yield_per=batch_size) \
+                               .execute(select(*columns))
+                for batch in result.partitions(batch_size):
+                    with dst.begin() as d_conn:
+                        d_conn.execute(table.insert(), [dict(row._mapping) for row in batch])
+                    total += len(batch)
+            if dst.dialect.name == 'postgresql':
+                _reset_sequence(dst, table)
+            copied[table.name] = total
+            log(f"{table.name}: {total} rows")
+    finally:
+        src.dispose()
+        dst.dispose()
+    return copied
+
+def _reset_sequence(engine, table):
+    """Move a serial id sequence past the copied ids so new inserts do not collide."""
+    pk = list(table.primary_key.columns)
+    if len(pk) != 1 or not pk[0].autoincrement or pk[0].type.python_type is not int:
+        return
+    name = pk[0].name
+    with engine.begin() as conn:
+        conn.execute(text(f"SELECT setval(pg_get_serial_sequence('\"{table.name}\"', '{name}'), "
+                          f"COALESCE((SELECT MAX(\"{name}\") FROM \"{table.name}\"), 0) + 1, false)"))
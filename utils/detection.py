@@ -0,0 +1,94 @@
+# utils/detection.py
+import os, glob, math, time, subprocess
+from concurrent.futures import ThreadPoolExecutor, wait
+
+# --------------------------------------------------
+# Single probe
+# --------------------------------------------------
+def normalize_path(path):
+    if not path:
+        return None
+    path = os.path.expandvars(path.strip('"'))
+    return os.path.normpath(path)
+
+def probe(item, timeout=5):
+    """
+    Check one software entry. item is a plain dict with
+    name / type / path_windows / cmd so it can be handed to a worker thread.
+    Returns True / False, never raises and never blocks longer than timeout.
+    """
+    try:
+        if item.get('type') == 'exe' and item.get('path_windows'):
+            clean_path = normalize_path(item['path_windows'])
+            if '*' in clean_path:
+                return bool(glob.glob(clean_path))
+            return os.path.exists(clean_path)
+        elif item.get('type') == 'cmd' and item.get('cmd'):
+            result = subprocess.run(item['cmd'], shell=True, stdout=subprocess.DEVNULL,
+                                    stderr=subprocess.DEVNULL, timeout=timeout)
+            return result.returncode == 0
+    except Exception:
+        pass
+    return False
+
+# --------------------------------------------------
+# Engine: parallel probes
+# --------------------------------------------------
+class DetectionEngine:
+    """
+    Runs all probes at once in a bounded thread pool (probes are subprocess /
+    filesystem bound, so threads are enough). `on_results` is called with
+    {name: installed} after every refresh so the caller can write everything
+    back in one transaction; `on_probe` (optional) gets (item, seconds,
+    installed) for every single probe.
+    """
+
+    def __init__(self, max_workers=8, timeout=5, on_results=None, on_probe=None):
+        self.timeout = timeout
+        self.max_workers = max_workers
+        self.on_results = on_results
+        self.on_probe = on_probe
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='detect')
+
+    def _probe(self, item):
+        if not self.on_probe:
+            return probe(item, self.timeout)
+        start = time.perf_counter()
+        installed = probe(item, self.timeout)
+        try:
+            self.on_probe(item, time.perf_counter() - start, installed)
+        except Exception:
+            pass
+        return installed
+
+    def check(self, item):
+        """Probe a single entry now (bounded by timeout)."""
+        return self._probe(item)
+
+    def refresh(self, items):
+        """
+        Probe every item in parallel, return {name: installed}. A probe that
+        has not finished by the end is left out, so its stored status stays
+        as it was instead of turning into 'not installed'.
+        """
+        futures = {self._pool.submit(self._probe, item): item['name'] for item in items}
+        # subprocess.run enforces the per-probe timeout; the wait allows one timeout per round
+        # of max_workers probes, plus slack
+        rounds = math.ceil(len(futures) / self.max_workers)
+        done, not_done = wait(futures, timeout=rounds * self.timeout + 5)
+        results = {}
+        for fut in done:
+            try:
+                results[futures[fut]] = bool(fut.result())
+            except Exception:
+                results[futures[fut]] = False
+        for fut in not_done:
+            fut.cancel()
+        if not_done:
+            print(f"[Detection] {len(not_done)} probes did not finish in time, kept their last status")
+        if self.on_results and results:
+            try:
+                self.on_results(results)
+            except Exception as e:
+                print(f"[Detection] could not store results: {e}")
+        return results
@@ -0,0 +1,58 @@
+# utils/events.py
+import json, queue, threading
+
+class EventBroker:
+    """
+    In-process publish/subscribe for Server-Sent Events. Each open stream owns
+    a bounded queue; publishers never block, a slow client just loses its
+    oldest pending events.
+    """
+
+    def __init__(self, maxsize=200):
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._subscribers = set()
+
+    def subscribe(self):
+        q = queue.Queue(maxsize=self.maxsize)
+        with self._lock:
+            self._subscribers.add(q)
+        return q
+
+    def unsubscribe(self, q):
+        with self._lock:
+            self._subscribers.discard(q)
+
+    def publish(self, event, data):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for q in subscribers:
+            while True:
+                try:
+                    q.put_nowait((event, data))
+                    break
+                except queue.Full:
+                    try:
+                        q.get_nowait()
+                    except queue.Empty:
+                        pass
+
+    @staticmethod
+    def format(event, data):
+        return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+    def stream(self, q, initial=(), heartbeat=30):
+        """SSE body generator. Sleeps on the queue, so an idle stream costs no work."""
+        try:
+            yield "retry: 5000\n\n"
+            for event, data in initial:
+                yield self.format(event, data)
+            while True:
+                try:
+                    event, data = q.get(timeout=heartbeat)
+                except queue.Empty:
+                    yield ": keep-alive\n\n"     # lets the server notice closed connections
+                    continue
+                yield self.format(event, data)
+        finally:
+            self.unsubscribe(q)
@@ -1,11 +1,30 @@
 # utils/installer.py
-import os, glob, subprocess, requests, threading
+import os, glob, json, hashlib, subprocess, requests, threading
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlsplit
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from werkzeug.utils import secure_filename
 
 DOWNLOAD_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'downloads'))
 os.makedirs(DOWNLOAD_DIR, exist_ok=True)
 
+SEGMENTS = 4                        # parallel ranges for large downloads
+SEGMENT_MIN_SIZE = 16 * 1024 * 1024 # below this a single stream is faster
+STATE_SAVE_EVERY = 4 * 1024 * 1024  # persist resume offsets this often
+
+# One pooled session for every download: keep-alive, retries on flaky mirrors
+SESSION = requests.Session()
+SESSION.headers['User-Agent'] = 'Mozilla/5.0'
+_adapter = HTTPAdapter(pool_connections=8, pool_maxsize=32,
+                       max_retries=Retry(total=3, backoff_factor=1, status_forcelist=(500, 502, 503, 504),
+                                         allowed_methods=('HEAD', 'GET')))
+SESSION.mount('http://', _adapter)
+SESSION.mount('https://', _adapter)
+
+class ChecksumMismatch(ValueError):
+    pass
+
 def path_exists_windows(path):
     if not path:
         return False
@@ -30,19 +49,166 @@ def detect_installed(item):
     else:
         return False
 
-def download_to_file(url, filename, progress_callback=None, chunk_size=1024*64):
-    # downloads to downloads/filename (returns full path)
+def installer_filename(name, url):
+    """
+    Cache file name for a software installer, e.g. Code_Blocks-3f9a1c2e.exe.
+    The short hash of the URL means a changed URL never reuses the old
+    download (or its .part file).
+    """
+    ext = os.path.splitext(urlsplit(url or '').path)[1].lower()
+    if ext not in ('.exe', '.msi', '.zip'):
+        ext = '.exe'
+    tag = hashlib.sha256((url or '').encode('utf-8')).hexdigest()[:8]
+    return f"{secure_filename(name) or 'installer'}-{tag}{ext}"
+
+def cached_path(filename, sha256=None):
+    """Path of a completed download in the local cache, or None."""
     local_path = os.path.join(DOWNLOAD_DIR, filename)
-    with requests.get(url, stream=True, allow_redirects=True, timeout=30) as r:
+    if not os.path.exists(local_path):
+        return None
+    if sha256:
+        try:
+            with open(local_path + '.sha256') as f:
+                if f.read().strip() != sha256.lower():
+                    return None
+        except OSError:
+            return None
+    return local_path
+
+def sha256_file(path, chunk_size=1024 * 1024):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+class _Progress:
+    def __init__(self, total, callback, done=0):
+        self.total, self.callback, self.done = total, callback, done
+        self.lock = threading.Lock()
+
+    def add(self, n):
+        with self.lock:
+            self.done += n
+            done = self.done
+        if self.callback and self.total:
+            self.callback(min(done, self.total), self.total)
+
+def _probe(url, timeout):
+    """(final url after redirects, size or 0, server accepts byte ranges)"""
+    try:
+        r = SESSION.head(url, allow_redirects=True, timeout=timeout)
+        if r.ok:
+            total = int(r.headers.get('content-length', 0) or 0)
+            return r.url, total, total > 0 and r.headers.get('accept-ranges', '').lower() == 'bytes'
+    except requests.RequestException:
+        pass
+    return url, 0, False
+
+def _download_single(url, part, progress_callback, chunk_size, timeout):
+    """Single stream, resuming from an existing .part file with a Range request."""
+    offset = os.path.getsize(part) if os.path.exists(part) else 0
+    headers = {'Range': f'bytes={offset}-'} if offset else {}
+    with SESSION.get(url, stream=True, allow_redirects=True, headers=headers, timeout=timeout) as r:
+        if offset and r.status_code == 416:
+            return                          # nothing left to fetch
         r.raise_for_status()
-        total = int(r.headers.get('content-length', 0))
-        downloaded = 0
-        with open(local_path, 'wb') as f:
+        if offset and r.status_code != 206:
+            offset = 0                      # server ignored the range, start over
+        length = int(r.headers.get('content-length', 0) or 0)
+        progress = _Progress(offset + length if length else 0, progress_callback, offset)
+        with open(part, 'ab' if offset else 'wb') as f:
             for chunk in r.iter_content(chunk_size=chunk_size):
                 if not chunk:
                     continue
                 f.write(chunk)
-                downloaded += len(chunk)
-                if progress_callback and total:
-                    progress_callback(downloaded, total)
+                progress.add(len(chunk))
+
+def _download_segmented(url, part, total, segments, progress_callback, chunk_size, timeout):
+    """Fetch `segments` byte ranges in parallel into a preallocated .part file."""
+    state_path = part + '.json'
+    state = None
+    if os.path.exists(part) and os.path.getsize(part) == total:
+        try:
+            with open(state_path) as f:
+                saved = json.load(f)
+            if saved.get('total') == total:
+                state = saved['segments']
+        except (OSError, ValueError, KeyError):
+            state = None
+    if state is None:
+        size = -(-total // segments)
+        state = [[start, min(start + size, total) - 1, 0] for start in range(0, total, size)]
+        with open(part, 'wb') as f:
+            f.truncate(total)
+
+    progress = _Progress(total, progress_callback, sum(seg[2] for seg in state))
+    lock = threading.Lock()
+
+    def save_state():
+        with lock:
+            with open(state_path, 'w') as f:
+                json.dump({'total': total, 'segments': state}, f)
+
+    def fetch(seg):
+        start, end, done = seg
+        if start + done > end:
+            return
+        headers = {'Range': f'bytes={start + done}-{end}'}
+        with SESSION.get(url, stream=True, headers=headers, timeout=timeout) as r:
+            r.raise_for_status()
+            if r.status_code != 206:
+                raise IOError('server ignored the range request')
+            unsaved = 0
+            with open(part, 'r+b') as f:
+                f.seek(start + done)
+                for chunk in r.iter_content(chunk_size=chunk_size):
+                    if not chunk:
+                        continue
+                    f.write(chunk)
+                    seg[2] += len(chunk)
+                    progress.add(len(chunk))
+                    unsaved += len(chunk)
+                    if unsaved >= STATE_SAVE_EVERY:
+                        f.flush()
+                        save_state()
+                        unsaved = 0
+
+    try:
+        with ThreadPoolExecutor(max_workers=len(state)) as pool:
+            list(pool.map(fetch, state))
+    finally:
+        save_state()
+    os.remove(state_path)
+
+def download_to_file(url, filename, progress_callback=None, chunk_size=1024*64, sha256=None,
+                     segments=SEGMENTS, timeout=30):
+    """
+    Download url into downloads/filename (returns full path).
+    Completed files are served from the local cache, interrupted ones resume
+    from their .part file, large files are fetched as parallel byte ranges and
+    the result is checked against sha256 when one is given.
+    """
+    cached = cached_path(filename, sha256)
+    if cached:
+        if progress_callback:
+            size = os.path.getsize(cached)
+            progress_callback(size, size)
+        return cached
+
+    local_path = os.path.join(DOWNLOAD_DIR, filename)
+    part = local_path + '.part'
+    final_url, total, ranges = _probe(url, timeout)
+    if ranges and segments > 1 and total >= SEGMENT_MIN_SIZE:
+        _download_segmented(final_url, part, total, segments, progress_callback, chunk_size, timeout)
+    else:
+        _download_single(final_url, part, progress_callback, chunk_size, timeout)
+
+    digest = sha256_file(part)
+    if sha256 and digest != sha256.lower():
+        os.remove(part)
+        raise ChecksumMismatch(f'{filename}: expected sha256 {sha256}, got {digest}')
+    os.replace(part, local_path)
+    with open(local_path + '.sha256', 'w') as f:
+        f.write(digest)
     return local_path
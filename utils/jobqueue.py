@@ -0,0 +1,353 @@
+# utils/jobqueue.py
+import os, json, time, random, socket, threading
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import select, insert, update, delete
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = 'queued', 'running', 'done', 'failed', 'cancelled'
+ACTIVE = (QUEUED, RUNNING)
+
+class JobCancelled(Exception):
+    pass
+
+def _epoch(value):
+    return value.replace(tzinfo=timezone.utc).timestamp() if value else None
+
+class JobQueue:
+    """
+    Jobs stored as rows, so they outlive the process that queued them. Web
+    workers enqueue and read; worker processes claim and run. Claiming is a
+    conditional UPDATE (state still 'queued'), so two workers never run the
+    same row. Higher priority goes first, then the oldest job. Failed
+    attempts are retried with exponential backoff until max_attempts, and a
+    running job whose worker stops sending heartbeats is put back in the queue.
+    """
+
+    def __init__(self, engine, table, retry_base=10, retry_max=600, stale_seconds=60):
+        self.engine = engine
+        self.table = table
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.stale_seconds = stale_seconds
+
+    def to_dict(self, row):
+        return {'id': row.id, 'kind': row.kind, 'key': row.key, 'state': row.state,
+                'priority': row.priority, 'progress': row.progress, 'attempts': row.attempts,
+                'max_attempts': row.max_attempts, 'error': row.error,
+                'payload': json.loads(row.payload) if row.payload else {},
+                'result': json.loads(row.result) if row.result else None,
+                'cancel_requested': bool(row.cancel_requested), 'worker': row.locked_by,
+                'created_at': _epoch(row.created_at), 'started_at': _epoch(row.started_at),
+                'finished_at': _epoch(row.finished_at), 'run_after': _epoch(row.run_after)}
+
+    def _active_query(self, kind, key):
+        t = self.table
+        return select(t).where(t.c.kind == kind, t.c.key == key, t.c.state.in_(ACTIVE)).order_by(t.c.id)
+
+    def enqueue(self, kind, payload=None, key=None, priority=0, max_attempts=3, delay=0):
+        """
+        Queue a job; returns (job, created). When `key` is given and a job of
+        the same kind and key is still queued or running, that one is returned.
+        """
+        t = self.table
+        if key is not None:
+            with self.engine.connect() as conn:
+                row = conn.execute(self._active_query(kind, key).limit(1)).first()
+            if row:
+                return self.to_dict(row), False
+        now = datetime.utcnow()
+        with self.engine.begin() as conn:
+            job_id = conn.execute(insert(t).values(
+                kind=kind, key=key, payload=json.dumps(payload or {}), priority=priority, state=QUEUED,
+                progress=0, attempts=0, max_attempts=max_attempts, cancel_requested=False,
+                run_after=now + timedelta(seconds=delay), created_at=now)).inserted_primary_key[0]
+        if key is not None:
+            # two web workers may have queued the same key at once: the oldest one wins
+            with self.engine.begin() as conn:
+                first = conn.execute(self._active_query(kind, key).limit(1)).first()
+                if first and first.id != job_id:
+                    conn.execute(update(t).where(t.c.id == job_id)
+                                 .values(state=CANCELLED, finished_at=now, error='duplicate'))
+                    return self.to_dict(first), False
+        return self.get(job_id), True
+
+    def get(self, job_id):
+        with self.engine.connect() as conn:
+            row = conn.execute(select(self.table).where(self.table.c.id == job_id)).first()
+        return self.to_dict(row) if row else None
+
+    def latest(self, kind, key):
+        """Most recent job of this kind and key, finished or not."""
+        t = self.table
+        with self.engine.connect() as conn:
+            row = conn.execute(select(t).where(t.c.kind == kind, t.c.key == key)
+                               .order_by(t.c.id.desc()).limit(1)).first()
+        return self.to_dict(row) if row else None
+
+    def list(self, kinds=None, state=None, limit=100):
+        t = self.table
+        query = select(t).order_by(t.c.id.desc()).limit(limit)
+        if kinds:
+            query = query.where(t.c.kind.in_(kinds))
+        if state:
+            query = query.where(t.c.state == state)
+        with self.engine.connect() as conn:
+            return [self.to_dict(row) for row in conn.execute(query)]
+
+    def claim(self, worker_id, kinds=None):
+        """Take the next due job and mark it running for `worker_id`; None when nothing is due."""
+        t = self.table
+        for _ in range(5):          # lost the race for a row: try the next one
+            now = datetime.utcnow()
+            query = (select(t.c.id).where(t.c.state == QUEUED, t.c.run_after <= now)
+                     .order_by(t.c.priority.desc(), t.c.id).limit(1))
+            if kinds:
+                query = query.where(t.c.kind.in_(kinds))
+            with self.engine.connect() as conn:
+                job_id = conn.execute(query).scalar()
+            if job_id is None:
+                return None
+            with self.engine.begin() as conn:
+                claimed = conn.execute(update(t).where(t.c.id == job_id, t.c.state == QUEUED).values(
+                    state=RUNNING, locked_by=worker_id, heartbeat_at=now, started_at=now,
+                    attempts=t.c.attempts + 1)).rowcount
+            if claimed:
+                return self.get(job_id)
+        return None
+
+    def heartbeat(self, job_id, worker_id, progress):
+        """Store progress and prove the worker is alive. Returns True when a cancel was requested."""
+        t = self.table
+        with self.engine.begin() as conn:
+            conn.execute(update(t).where(t.c.id == job_id, t.c.locked_by == worker_id, t.c.state == RUNNING)
+                         .values(heartbeat_at=datetime.utcnow(), progress=progress))
+            return bool(conn.execute(select(t.c.cancel_requested).where(t.c.id == job_id)).scalar())
+
+    def finish(self, job_id, state, worker_id, result=None, error=None):
+        """Record the outcome, only while worker_id still holds the job. False if it lost it."""
+        t = self.table
+        values = {'state': state, 'finished_at': datetime.utcnow(), 'locked_by': None, 'error': error}
+        if state == DONE:
+            values.update(progress=100, result=json.dumps(result) if result is not None else None)
+        with self.engine.begin() as conn:
+            return bool(conn.execute(update(t).where(t.c.id == job_id, t.c.locked_by == worker_id,
+                                                     t.c.state == RUNNING).values(**values)).rowcount)
+
+    def backoff(self, attempts):
+        """Seconds before the next attempt: doubling from retry_base, capped, with jitter."""
+        delay = min(self.retry_max, self.retry_base * 2 ** max(0, attempts - 1))
+        return delay * random.uniform(0.75, 1.25)
+
+    def fail(self, job, error, worker_id):
+        """
+        Retry later if attempts are left, else mark failed; a job asked to
+        cancel ends cancelled instead. Only while worker_id still holds the
+        job. Returns the new state, None if it lost the job.
+        """
+        return self._release(job, error, locked_by=worker_id)
+
+    def _release(self, job, error, **guard):
+        t = self.table
+        where = [t.c.id == job['id'], t.c.state == RUNNING] + [t.c[k] == v for k, v in guard.items()]
+        now = datetime.utcnow()
+        with self.engine.begin() as conn:
+            row = conn.execute(select(t.c.cancel_requested).where(*where)).first()
+            if row is None:
+                return None
+            if row.cancel_requested:
+                values = {'state': CANCELLED, 'finished_at': now}
+            elif job['attempts'] >= job['max_attempts']:
+                values = {'state': FAILED, 'finished_at': now}
+            else:
+                values = {'state': QUEUED, 'run_after': now + timedelta(seconds=self.backoff(job['attempts']))}
+            if not conn.execute(update(t).where(*where).values(locked_by=None, error=error, **values)).rowcount:
+                return None
+        return values['state']
+
+    def cancel(self, job_id):
+        """Cancel a queued job now, or ask the worker running it to stop. False if already finished."""
+        t = self.table
+        with self.engine.begin() as conn:
+            if conn.execute(update(t).where(t.c.id == job_id, t.c.state == QUEUED)
+                            .values(state=CANCELLED, finished_at=datetime.utcnow())).rowcount:
+                return True
+            return bool(conn.execute(update(t).where(t.c.id == job_id, t.c.state == RUNNING)
+                                     .values(cancel_requested=True)).rowcount)
+
+    def retry(self, job_id):
+        """Queue a failed or cancelled job again with a fresh set of attempts."""
+        t = self.table
+        with self.engine.begin() as conn:
+            return bool(conn.execute(update(t).where(t.c.id == job_id, t.c.state.in_((FAILED, CANCELLED)))
+                                     .values(state=QUEUED, attempts=0, progress=0, error=None,
+                                             cancel_requested=False, run_after=datetime.utcnow(),
+                                             finished_at=None)).rowcount)
+
+    def recover(self):
+        """Requeue running jobs whose worker died (no heartbeat for stale_seconds). Returns how many."""
+        t = self.table
+        cutoff = datetime.utcnow() - timedelta(seconds=self.stale_seconds)
+        with self.engine.connect() as conn:
+            rows = conn.execute(select(t).where(t.c.state == RUNNING, t.c.heartbeat_at < cutoff)).all()
+        recovered = 0
+        for row in rows:
+            # only if nobody touched it in the meantime
+            if self._release(self.to_dict(row), f'worker {row.locked_by} stopped responding',
+                             locked_by=row.locked_by, heartbeat_at=row.heartbeat_at):
+                recovered += 1
+        return recovered
+
+    def prune(self, older_than_seconds):
+        """Delete finished jobs older than the cutoff."""
+        t = self.table
+        cutoff = datetime.utcnow() - timedelta(seconds=older_than_seconds)
+        with self.engine.begin() as conn:
+            return conn.execute(delete(t).where(t.c.state.in_((DONE, FAILED, CANCELLED)),
+                                                t.c.finished_at < cutoff)).rowcount
+
+
+class JobContext:
+    """What a handler gets: the job's payload, progress reporting and cancellation checks."""
+
+    def __init__(self, job, on_change=None):
+        self.id = job['id']
+        self.kind = job['kind']
+        self.key = job['key']
+        self.payload = job['payload']
+        self.attempt = job['attempts']
+        self.progress = job['progress']
+        self.cancelled = job['cancel_requested']
+        self.on_change = on_change
+
+    def set_progress(self, value):
+        """Update progress; listeners only hear about it when the value changes."""
+        value = int(value)
+        if value != self.progress:
+            self.progress = value
+            self.changed(RUNNING)
+
+    def changed(self, state, error=None):
+        if self.on_change:
+            try:
+                self.on_change({'id': self.id, 'kind': self.kind, 'name': self.key, 'state': state,
+                                'progress': self.progress, 'error': error})
+            except Exception:
+                pass
+
+    def check_cancelled(self):
+        """Call from inside long loops; raises JobCancelled once a cancel was requested."""
+        if self.cancelled:
+            raise JobCancelled(self.key)
+
+
+class JobWorker:
+    """
+    Claims jobs from a JobQueue and runs them on `threads` threads. `handlers`
+    maps a job kind to fn(ctx); the return value is stored as the result.
+    `wrap` is a context manager factory every handler runs inside (the Flask
+    app context); `on_change` hears every state and progress change. Progress
+    and heartbeats reach the table every `heartbeat` seconds. `on_upkeep`
+    (optional) runs inside `wrap` with the periodic recover / prune.
+    """
+
+    def __init__(self, queue, handlers, threads=2, poll=1.0, heartbeat=2.0, wrap=None, on_change=None,
+                 keep_seconds=7 * 86400, on_upkeep=None):
+        self.queue = queue
+        self.handlers = dict(handlers)
+        self.threads = threads
+        self.poll = poll
+        self.heartbeat = heartbeat
+        self.wrap = wrap or nullcontext
+        self.on_change = on_change
+        self.keep_seconds = keep_seconds
+        self.on_upkeep = on_upkeep
+        self.worker_id = f'{socket.gethostname()}:{os.getpid()}'
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._running = {}          # job id -> JobContext
+        self._thread = None
+
+    def start(self):
+        """Run in a background thread of this process (single-process servers)."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self.run, name='job-worker', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop claiming; jobs already running are finished first."""
+        self._stop.set()
+
+    def run(self):
+        threading.Thread(target=self._beat, name='job-heartbeat', daemon=True).start()
+        free = threading.Semaphore(self.threads)
+        last_upkeep = 0
+        with ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix='job') as pool:
+            while not self._stop.is_set():
+                if time.monotonic() - last_upkeep > self.queue.stale_seconds:
+                    last_upkeep = time.monotonic()
+                    self._upkeep()
+                if not free.acquire(timeout=self.poll):
+                    continue
+                try:
+                    job = self.queue.claim(self.worker_id, kinds=list(self.handlers))
+                except Exception as e:
+                    print(f"[Jobs] claim failed: {e}")
+                    job = None
+                if not job:
+                    free.release()
+                    self._stop.wait(self.poll)
+                    continue
+                pool.submit(self._run, job, free)
+
+    def _upkeep(self):
+        try:
+            if self.queue.recover():
+                print("[Jobs] requeued jobs of a stopped worker")
+            self.queue.prune(self.keep_seconds)
+            if self.on_upkeep:
+                with self.wrap():
+                    self.on_upkeep()
+        except Exception as e:
+            print(f"[Jobs] upkeep failed: {e}")
+
+    def _beat(self):
+        while not self._stop.is_set() or self._running:
+            time.sleep(self.heartbeat)
+            with self._lock:
+                running = list(self._running.values())
+            for ctx in running:
+                try:
+                    ctx.cancelled = self.queue.heartbeat(ctx.id, self.worker_id, ctx.progress) or ctx.cancelled
+                except Exception as e:
+                    print(f"[Jobs] heartbeat failed for job {ctx.id}: {e}")
+
+    def _run(self, job, free):
+        ctx = JobContext(job, self.on_change)
+        with self._lock:
+            self._running[ctx.id] = ctx
+        ctx.changed(RUNNING)
+        try:
+            with self.wrap():
+                result = self.handlers[job['kind']](ctx)
+            if self.queue.finish(ctx.id, DONE, self.worker_id, result=result):
+                ctx.progress = 100
+                ctx.changed(DONE)
+            else:
+                print(f"[Jobs] job {ctx.id} was taken over, result dropped")
+        except JobCancelled:
+            if self.queue.finish(ctx.id, CANCELLED, self.worker_id):
+                ctx.changed(CANCELLED)
+        except Exception as e:
+            print(f"[Jobs] {job['kind']} job {ctx.id} failed (attempt {job['attempts']}): {e}")
+            try:
+                state = self.queue.fail(job, str(e), self.worker_id)
+                if state:
+                    ctx.changed(state, error=str(e))
+            except Exception as e2:
+                print(f"[Jobs] could not record failure of job {ctx.id}: {e2}")
+        finally:
+            with self._lock:
+                self._running.pop(ctx.id, None)
+            free.release()
@@ -0,0 +1,99 @@
+# utils/metrics.py
+import bisect, threading
+
+# seconds; roughly doubling from 5 ms to 10 s
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _label_text(names, values):
+    if not names:
+        return ''
+    return '{' + ','.join(f'{n}="{_escape(v)}"' for n, v in zip(names, values)) + '}'
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class MetricsRegistry:
+    """
+    Minimal Prometheus-style registry: labelled counters and histograms kept
+    in process memory. snapshot() / merge() let several worker processes be
+    summed into one /metrics answer.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._meta = {}      # name -> (kind, help, label names, buckets)
+        self._values = {}    # name -> {label values: count | [bucket counts..., sum, count]}
+
+    def counter(self, name, help_text, labels=()):
+        self._meta[name] = ('counter', help_text, tuple(labels), None)
+        self._values.setdefault(name, {})
+
+    def histogram(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+        self._meta[name] = ('histogram', help_text, tuple(labels), tuple(buckets))
+        self._values.setdefault(name, {})
+
+    def inc(self, name, *labels, amount=1):
+        with self._lock:
+            series = self._values[name]
+            series[labels] = series.get(labels, 0) + amount
+
+    def observe(self, name, value, *labels):
+        buckets = self._meta[name][3]
+        with self._lock:
+            series = self._values[name]
+            entry = series.get(labels)
+            if entry is None:
+                entry = series[labels] = [0] * (len(buckets) + 2)
+            i = bisect.bisect_left(buckets, value)     # first bucket with le >= value
+            if i < len(buckets):
+                entry[i] += 1                          # larger values only show up in +Inf
+            entry[-2] += value
+            entry[-1] += 1
+
+    def snapshot(self):
+        """JSON-friendly copy: {name: [[label values, value], ...]}."""
+        with self._lock:
+            return {name: [[list(k), v if isinstance(v, (int, float)) else list(v)] for k, v in series.items()]
+                    for name, series in self._values.items()}
+
+    @staticmethod
+    def merge(snapshots):
+        """Sum several snapshot() results series by series."""
+        total = {}
+        for snap in snapshots:
+            for name, series in snap.items():
+                merged = total.setdefault(name, {})
+                for labels, value in series:
+                    key = tuple(labels)
+                    if isinstance(value, list):
+                        current = merged.get(key) or [0] * len(value)
+                        merged[key] = [a + b for a, b in zip(current, value)]
+                    else:
+                        merged[key] = merged.get(key, 0) + value
+        return total
+
+    def render(self, values=None):
+        """Prometheus text exposition of `values` (merged snapshots) or this registry."""
+        if values is None:
+            values = self.merge([self.snapshot()])
+        lines = []
+        for name, (kind, help_text, label_names, buckets) in sorted(self._meta.items()):
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+            for labels, value in sorted(values.get(name, {}).items()):
+                if kind == 'counter':
+                    lines.append(f'{name}{_label_text(label_names, labels)} {_number(value)}')
+                    continue
+                cumulative = 0
+                for bound, count in zip(buckets, value):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{_label_text(label_names + ("le",), labels + (_number(bound),))} '
+                                 f'{cumulative}')
+                lines.append(f'{name}_bucket{_label_text(label_names + ("le",), labels + ("+Inf",))} {value[-1]}')
+                lines.append(f'{name}_sum{_label_text(label_names, labels)} {_number(value[-2])}')
+                lines.append(f'{name}_count{_label_text(label_names, labels)} {value[-1]}')
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,97 @@
+# utils/migrations.py
+from itertools import groupby
+from sqlalchemy import bindparam, inspect, text
+
+# Columns added after the first release: table -> {column: DDL type}
+COLUMNS = {
+    'submission': {'content_hash': 'VARCHAR(64)'},
+    'software': {'sha256': 'VARCHAR(64)'},
+    'exam': {'max_upload_kb': 'INTEGER', 'allowed_extensions': 'VARCHAR(255)'},
+}
+
+# (index name, table, columns, unique)
+INDEXES = [
+    ('ix_submission_content_hash', 'submission', ['content_hash'], False),
+    ('uq_submission_exam_student', 'submission', ['exam_id', 'student_id'], True),
+    ('ix_submission_student_id', 'submission', ['student_id'], False),
+    ('ix_user_email_role', 'user', ['email', 'role'], False),
+    ('ix_exam_start_time', 'exam', ['start_time'], False),
+    ('ix_exam_teacher_id', 'exam', ['teacher_id'], False),
+    ('ix_lab_check_checked_at', 'lab_check', ['checked_at'], False),
+    ('ix_lab_check_host_software', 'lab_check', ['hostname', 'software', 'checked_at'], False),
+]
+
+class DuplicateSubmissions(RuntimeError):
+    pass
+
+def duplicate_submissions(conn):
+    """Every submission of an (exam, student) pair that has more than one, oldest first."""
+    return conn.execute(text(
+        'SELECT s.id, s.exam_id, s.student_id, s.file_name, s.mark FROM submission s '
+        'JOIN (SELECT exam_id, student_id FROM submission GROUP BY exam_id, student_id '
+        '      HAVING COUNT(*) > 1) d ON s.exam_id = d.exam_id AND s.student_id = d.student_id '
+        'ORDER BY s.exam_id, s.student_id, s.id')).all()
+
+def dedupe_submissions(conn, apply=False):
+    """
+    Keep only the newest submission per (exam, student) so the unique index
+    can be built. Without `apply` nothing is deleted and DuplicateSubmissions
+    is raised, so a plain start never drops student work. Each removed row is
+    printed; its fingerprints go with it, and a mark given to an older copy
+    is moved to the newest one when that has none.
+    """
+    rows = duplicate_submissions(conn)
+    if not rows:
+        return
+    pairs = {(row.exam_id, row.student_id) for row in rows}
+    if not apply:
+        raise DuplicateSubmissions(
+            f'{len(pairs)} student(s) have more than one submission for the same exam; '
+            f'run "flask upgrade-db --dedupe-submissions" to keep only the newest')
+    removed = []
+    for _, group in groupby(rows, key=lambda row: (row.exam_id, row.student_id)):
+        *older, newest = group
+        marks = [row.mark for row in older if row.mark is not None]
+        if newest.mark is None and marks:
+            conn.execute(text('UPDATE submission SET mark = :mark WHERE id = :id'),
+                         {'mark': marks[-1], 'id': newest.id})
+            print(f"[Migrate] submission {newest.id}: kept mark {marks[-1]} of an older copy")
+        for row in older:
+            print(f"[Migrate] removing submission {row.id} (exam {row.exam_id}, student {row.student_id}, "
+                  f"file {row.file_name}, mark {row.mark}); newest is {newest.id}")
+            removed.append(row.id)
+    ids = bindparam('ids', expanding=True)
+    if inspect(conn).has_table('fingerprint'):
+        conn.execute(text('DELETE FROM fingerprint WHERE submission_id IN :ids').bindparams(ids), {'ids': removed})
+    conn.execute(text('DELETE FROM submission WHERE id IN :ids').bindparams(ids), {'ids': removed})
+    print(f"[Migrate] removed {len(removed)} duplicate submission(s)")
+
+# work that has to happen before an index is created on an existing table
+BEFORE_INDEX = {
+    'uq_submission_exam_student': dedupe_submissions,
+}
+
+def upgrade(engine, dedupe=False):
+    """
+    Bring an existing database up to the current models. db.create_all()
+    only creates missing tables, so new columns / indexes are added here.
+    Safe to run on every start: steps that would delete rows refuse unless
+    `dedupe` is set (flask upgrade-db --dedupe-submissions).
+    """
+    insp = inspect(engine)
+    with engine.begin() as conn:
+        for table, columns in COLUMNS.items():
+            if not insp.has_table(table):
+                continue
+            existing = {c['name'] for c in insp.get_columns(table)}
+            for name, ddl in columns.items():
+                if name not in existing:
+                    conn.execute(text(f'ALTER TABLE {table} ADD COLUMN {name} {ddl}'))
+        for name, table, columns, unique in INDEXES:
+            if not insp.has_table(table):
+                continue
+            if name in BEFORE_INDEX and name not in {i['name'] for i in insp.get_indexes(table)}:
+                BEFORE_INDEX[name](conn, apply=dedupe)
+            quoted = ', '.join(f'"{c}"' for c in columns)
+            conn.execute(text(f'CREATE {"UNIQUE " if unique else ""}INDEX IF NOT EXISTS {name} '
+                              f'ON "{table}" ({quoted})'))
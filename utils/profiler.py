@@ -0,0 +1,62 @@
+# utils/profiler.py
+import os, sys, threading, time
+from collections import Counter
+
+class StackSampler:
+    """
+    Sampling profiler for chosen requests. Threads register while they serve a
+    profiled request; one background thread samples their stacks every
+    `interval` seconds. finish() appends the request's stacks in the folded
+    format ("outer;inner;leaf count") that flamegraph.pl and speedscope read.
+    """
+
+    def __init__(self, out_dir, interval=0.005):
+        self.out_dir = out_dir
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._active = {}           # thread id -> Counter of folded stacks
+        self._thread = None
+
+    def start(self, thread_id=None):
+        thread_id = thread_id or threading.get_ident()
+        with self._lock:
+            self._active[thread_id] = Counter()
+            if not self._thread or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+                self._thread.start()
+
+    def finish(self, name, thread_id=None):
+        """Stop sampling the thread and append its stacks to <out_dir>/<name>.folded."""
+        thread_id = thread_id or threading.get_ident()
+        with self._lock:
+            stacks = self._active.pop(thread_id, None)
+        if not stacks:
+            return 0
+        os.makedirs(self.out_dir, exist_ok=True)
+        path = os.path.join(self.out_dir, name.replace('/', '_') + '.folded')
+        with self._lock, open(path, 'a', encoding='utf-8') as f:
+            for stack, count in stacks.items():
+                f.write(f'{stack} {count}\n')
+        return sum(stacks.values())
+
+    @staticmethod
+    def fold(frame):
+        parts = []
+        while frame is not None:
+            code = frame.f_code
+            parts.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})')
+            frame = frame.f_back
+        return ';'.join(reversed(parts))
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                if not self._active:
+                    self._thread = None
+                    return
+                frames = sys._current_frames()
+                for thread_id, stacks in self._active.items():
+                    frame = frames.get(thread_id)
+                    if frame is not None:
+                        stacks[self.fold(frame)] += 1
@@ -0,0 +1,150 @@
+# utils/sharedstate.py
+import os, json, time, socket, threading, uuid
+from datetime import datetime, timedelta
+from sqlalchemy import select, insert, update, delete, func
+from sqlalchemy.exc import IntegrityError
+
+class MemoryState:
+    """Key/value state for a single process (the dev server, waitress)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data = {}
+
+    def get(self, key):
+        with self._lock:
+            return self._data.get(key)
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+
+    def get_many(self, keys):
+        with self._lock:
+            return {k: self._data[k] for k in keys if k in self._data}
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def items(self, prefix=''):
+        with self._lock:
+            return {k: v for k, v in self._data.items() if k.startswith(prefix)}
+
+
+class DatabaseState:
+    """
+    Same interface as MemoryState, stored as JSON in a table so every
+    gunicorn worker reads the values the other workers wrote.
+    """
+
+    def __init__(self, engine, table):
+        self.engine = engine
+        self.table = table
+
+    def get(self, key):
+        t = self.table
+        with self.engine.connect() as conn:
+            row = conn.execute(select(t.c.value).where(t.c.key == key)).first()
+        return json.loads(row.value) if row and row.value else None
+
+    def get_many(self, keys):
+        """{key: value} for the keys that exist, in one query."""
+        t = self.table
+        with self.engine.connect() as conn:
+            rows = conn.execute(select(t.c.key, t.c.value).where(t.c.key.in_(list(keys)))).all()
+        return {r.key: json.loads(r.value) for r in rows if r.value}
+
+    def set(self, key, value):
+        t = self.table
+        values = {'value': json.dumps(value), 'updated_at': datetime.utcnow()}
+        with self.engine.begin() as conn:
+            if conn.execute(update(t).where(t.c.key == key).values(**values)).rowcount:
+                return
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(insert(t).values(key=key, **values))
+        except IntegrityError:          # another worker inserted it first
+            with self.engine.begin() as conn:
+                conn.execute(update(t).where(t.c.key == key).values(**values))
+
+    def delete(self, key):
+        with self.engine.begin() as conn:
+            conn.execute(delete(self.table).where(self.table.c.key == key))
+
+    def items(self, prefix=''):
+        t = self.table
+        with self.engine.connect() as conn:
+            rows = conn.execute(select(t.c.key, t.c.value)
+                                .where(t.c.key.startswith(prefix, autoescape=True))).all()
+        return {r.key: json.loads(r.value) for r in rows if r.value}
+
+
+class EventRelay:
+    """
+    Wraps an EventBroker so events reach SSE clients connected to any worker.
+    publish() delivers locally and appends a row to the event table; one
+    poller thread per process replays rows written by other processes into
+    the local broker and prunes rows older than keep_seconds.
+    """
+
+    def __init__(self, broker, engine, table, interval=1.0, keep_seconds=300):
+        self.broker = broker
+        self.engine = engine
+        self.table = table
+        self.interval = interval
+        self.keep_seconds = keep_seconds
+        self.origin = f'{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}'
+        self._lock = threading.Lock()
+        self._thread = None
+        self._last_id = 0
+
+    def publish(self, event, data):
+        self.broker.publish(event, data)
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(insert(self.table).values(origin=self.origin, kind=event, data=json.dumps(data),
+                                                       created_at=datetime.utcnow()))
+        except Exception as e:
+            print(f"[Events] could not share event: {e}")
+
+    def subscribe(self):
+        self._start()
+        return self.broker.subscribe()
+
+    def unsubscribe(self, q):
+        self.broker.unsubscribe(q)
+
+    def stream(self, q, initial=(), heartbeat=30):
+        return self.broker.stream(q, initial, heartbeat)
+
+    def _start(self):
+        # started lazily (first SSE client) so nothing runs in a gunicorn master before fork
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            with self.engine.connect() as conn:
+                self._last_id = conn.execute(select(func.max(self.table.c.id))).scalar() or 0
+            self._thread = threading.Thread(target=self._poll, name='event-relay', daemon=True)
+            self._thread.start()
+
+    def _poll(self):
+        t = self.table
+        last_prune = 0
+        while True:
+            time.sleep(self.interval)
+            try:
+                with self.engine.connect() as conn:
+                    rows = conn.execute(select(t.c.id, t.c.origin, t.c.kind, t.c.data)
+                                        .where(t.c.id > self._last_id).order_by(t.c.id)).all()
+                for row in rows:
+                    self._last_id = row.id
+                    if row.origin != self.origin:
+                        self.broker.publish(row.kind, json.loads(row.data))
+                if time.time() - last_prune > self.keep_seconds:
+                    cutoff = datetime.utcnow() - timedelta(seconds=self.keep_seconds)
+                    with self.engine.begin() as conn:
+                        conn.execute(delete(t).where(t.c.created_at < cutoff))
+                    last_prune = time.time()
+            except Exception as e:
+                print(f"[Events] relay poll failed: {e}")
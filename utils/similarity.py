@@ -0,0 +1,61 @@
+# utils/similarity.py
+import re, zlib
+
+# Token stream used for fingerprinting: identifiers collapse to V, literals to N / S,
+# so renaming variables or changing constants does not hide a copied solution.
+C_KEYWORDS = {
+    'auto', 'break', 'case', 'char', 'const', 'continue', 'default', 'do', 'double',
+    'else', 'enum', 'extern', 'float', 'for', 'goto', 'if', 'int', 'long', 'register',
+    'return', 'short', 'signed', 'sizeof', 'static', 'struct', 'switch', 'typedef',
+    'union', 'unsigned', 'void', 'volatile', 'while', 'bool', 'class', 'new', 'delete',
+    'NULL', 'malloc', 'free', 'printf', 'scanf',
+}
+
+_COMMENT_RE = re.compile(r'//[^\n]*|/\*.*?\*/', re.S)
+_PREPROC_RE = re.compile(r'^\s*#[^\n]*', re.M)
+_TOKEN_RE = re.compile(r'''
+      (?P<str>"(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')
+    | (?P<num>\d+(?:\.\d+)?[uUlLfF]*|0[xX][0-9a-fA-F]+)
+    | (?P<ident>[A-Za-z_]\w*)
+    | (?P<op>->|\+\+|--|<<|>>|<=|>=|==|!=|&&|\|\||[-+*/%=<>!&|^~?:;,.(){}\[\]])
+''', re.X)
+
+def tokenize(source):
+    """Normalized token list for C / C++ source."""
+    source = _PREPROC_RE.sub('', _COMMENT_RE.sub(' ', source))
+    tokens = []
+    for m in _TOKEN_RE.finditer(source):
+        kind = m.lastgroup
+        if kind == 'str':
+            tokens.append('S')
+        elif kind == 'num':
+            tokens.append('N')
+        elif kind == 'ident':
+            word = m.group()
+            tokens.append(word if word in C_KEYWORDS else 'V')
+        else:
+            tokens.append(m.group())
+    return tokens
+
+def fingerprints(source, k=12, window=8):
+    """
+    Winnowed fingerprint set (Schleimer et al.): hash every k-gram of tokens
+    and keep the minimum hash of each window of `window` consecutive hashes.
+    Hashes are 31-bit so they fit a plain INTEGER column.
+    """
+    tokens = tokenize(source)
+    if len(tokens) < k:
+        return set()
+    hashes = [zlib.crc32(' '.join(tokens[i:i + k]).encode()) & 0x7FFFFFFF
+              for i in range(len(tokens) - k + 1)]
+    if len(hashes) <= window:
+        return {min(hashes)}
+    selected = set()
+    for i in range(len(hashes) - window + 1):
+        selected.add(min(hashes[i:i + window]))
+    return selected
+
+def score(shared, count_a, count_b):
+    """Share of the smaller fingerprint set found in the other one (0..1)."""
+    smaller = min(count_a, count_b)
+    return shared / smaller if smaller else 0.0
@@ -0,0 +1,42 @@
+# utils/storage.py
+from sqlalchemy import event
+
+# Pragmas for a SQLite file shared by several web workers / threads:
+# WAL lets readers run alongside the single writer, busy_timeout makes a
+# writer wait for the lock instead of failing with "database is locked".
+PRODUCTION_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'foreign_keys': 'ON',
+    'temp_store': 'MEMORY',
+}
+
+def normalize_database_url(url):
+    """Accept the postgres:// form many hosts hand out; SQLAlchemy wants postgresql://."""
+    if url and url.startswith('postgres://'):
+        return 'postgresql://' + url[len('postgres://'):]
+    return url
+
+def engine_options(mode, uri, pool_size=10, max_overflow=20, pool_timeout=30):
+    """SQLALCHEMY_ENGINE_OPTIONS for the given storage mode ('development' or 'production')."""
+    if mode != 'production':
+        return {}
+    options = {'pool_size': pool_size, 'max_overflow': max_overflow,
+               'pool_timeout': pool_timeout, 'pool_pre_ping': True}
+    if uri.startswith('sqlite'):
+        # the driver-level timeout backs up busy_timeout; connections move between pool threads
+        options['connect_args'] = {'timeout': 30, 'check_same_thread': False}
+    return options
+
+def install_sqlite_pragmas(engine, pragmas):
+    """Run the pragmas on every new DBAPI connection of a SQLite engine."""
+    if engine.dialect.name != 'sqlite' or not pragmas:
+        return
+
+    @event.listens_for(engine, 'connect')
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name}={value}')
+        cursor.close()
@@ -0,0 +1,58 @@
+# utils/zipstream.py
+import time, zipfile
+
+class _Sink:
+    """
+    Write-only file object for zipfile. It has tell() but no seek(), which
+    puts zipfile in streaming mode (sizes go into data descriptors after each
+    member), and drain() hands out whatever was written since the last call.
+    """
+
+    def __init__(self):
+        self._chunks = []
+        self._pos = 0
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._pos += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._pos
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+def stream_zip(entries, chunk_size=64 * 1024, compression=zipfile.ZIP_DEFLATED):
+    """
+    Generator of ZIP bytes for entries (arcname, path, data): members come
+    from the file at `path`, or from `data` (bytes) when path is None.
+    Only one chunk is held in memory at a time; nothing touches the disk.
+    """
+    sink = _Sink()
+    with zipfile.ZipFile(sink, 'w', compression=compression) as zf:
+        for arcname, path, data in entries:
+            info = zipfile.ZipInfo(arcname, time.localtime()[:6])
+            info.compress_type = compression
+            with zf.open(info, 'w') as member:
+                if path is None:
+                    member.write(data)
+                else:
+                    with open(path, 'rb') as f:
+                        while True:
+                            chunk = f.read(chunk_size)
+                            if not chunk:
+                                break
+                            member.write(chunk)
+                            out = sink.drain()
+                            if out:
+                                yield out
+            out = sink.drain()
+            if out:
+                yield out
+    yield sink.drain()       # central directory
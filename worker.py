@@ -0,0 +1,27 @@
+# worker.py
+# Background job worker: runs queued installs, detection refreshes and
+# autograding outside the web processes. Start one (or more) next to gunicorn:
+#   python worker.py [--threads 2] [--kinds install,detect]
+# Jobs live in the database, so stopping or restarting it loses nothing.
+import os, signal, argparse
+
+# progress events have to reach the web workers, which share them through the database
+os.environ.setdefault('SHARED_STATE', 'database')
+os.environ.setdefault('STORAGE_MODE', 'production')
+os.environ['JOB_WORKER'] = 'external'
+
+from app import create_app, build_job_worker, JOB_HANDLERS
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Run queued background jobs.')
+    parser.add_argument('--threads', type=int, default=None, help='jobs run at once (JOB_WORKER_THREADS)')
+    parser.add_argument('--kinds', default='', help=f"comma separated, default all: {','.join(JOB_HANDLERS)}")
+    args = parser.parse_args()
+
+    app = create_app()
+    worker = build_job_worker(app, threads=args.threads, kinds=[k for k in args.kinds.split(',') if k])
+    # finish the running jobs, claim nothing new
+    signal.signal(signal.SIGINT, lambda *_: worker.stop())
+    signal.signal(signal.SIGTERM, lambda *_: worker.stop())
+    print(f"[Jobs] worker {worker.worker_id} running: {', '.join(worker.handlers)}")
+    worker.run()
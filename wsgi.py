@@ -0,0 +1,7 @@
+# wsgi.py
+# Production entry point. Linux: gunicorn -c gunicorn.conf.py wsgi:app
+# Windows: python serve.py (waitress). Each worker builds its own app here;
+# startup() (schema, config.json) has already run once before they start.
+from app import create_app
+
+app = create_app()